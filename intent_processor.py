@@ -1,164 +1,128 @@
 import spacy
-import re
+import functools
 
-class IntentProcessor:
+from intent_processor_fallback import IntentProcessorFallback, _VERB_TO_INTENT, _OBJECT_INTENTS
+
+# spaCy pipeline shared by every IntentProcessor, loaded on first use
+_nlp = None
+
+def _load_nlp():
+    """Load the English NLP model once and share it across instances
+    
+    Lemmas, POS tags and dependencies are used by the fallback path, which
+    needs the tagger, attribute ruler, lemmatizer and parser. Named entities
+    are not used, so NER is disabled.
+    
+    Returns:
+        Language: Loaded spaCy pipeline
+    """
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.load('en_core_web_sm', disable=['ner'])
+    return _nlp
+
+class IntentProcessor(IntentProcessorFallback):
+    # Intent patterns, the combined regex and the parameter extractors are
+    # inherited from IntentProcessorFallback; spaCy only replaces the
+    # keyword fallback.
+    
     def __init__(self):
         """Initialize the intent processor with spaCy"""
-        # Load the English NLP model
-        self.nlp = spacy.load('en_core_web_sm')
+        super().__init__()
         
-        # Define intent patterns
-        self.intent_patterns = {
-            'click': [
-                r'click\s+(?:on\s+)?(.+)',
-                r'press\s+(?:on\s+)?(.+)',
-                r'select\s+(.+)',
-                r'choose\s+(.+)',
-                r'tap\s+(?:on\s+)?(.+)'
-            ],
-            'type': [
-                r'type\s+(.+)',
-                r'enter\s+(.+)',
-                r'input\s+(.+)',
-                r'write\s+(.+)'
-            ],
-            'scroll': [
-                r'scroll\s+(up|down)(?:\s+(\d+))?',
-                r'move\s+(up|down)(?:\s+(\d+))?'
-            ],
-            'open': [
-                r'open\s+(.+)',
-                r'launch\s+(.+)',
-                r'start\s+(.+)',
-                r'go\s+to\s+(.+)',
-                r'navigate\s+to\s+(.+)'
-            ],
-            'help': [
-                r'help',
-                r'assist',
-                r'guide',
-                r'what\s+can\s+you\s+do'
-            ],
-            'exit': [
-                r'exit',
-                r'quit',
-                r'close',
-                r'bye',
-                r'goodbye'
-            ]
-        }
+        # Load the English NLP model
+        self.nlp = _load_nlp()
         
-        # Compile regex patterns
-        self.compiled_patterns = {}
-        for intent, patterns in self.intent_patterns.items():
-            self.compiled_patterns[intent] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        # Cache results for repeated utterances
+        self._cached_process_text = functools.lru_cache(maxsize=512)(self._process_text_uncached)
     
     def process_text(self, text):
         """Process text to determine intent and extract parameters
         
+        Repeated utterances are served from an LRU cache keyed by the
+        whitespace-normalized text. Case is kept because typed content and
+        open targets are passed through verbatim.
+        
         Args:
             text (str): The text to process
             
         Returns:
             tuple: (intent, parameters)
         """
-        # Process with spaCy
-        doc = self.nlp(text)
+        intent, params = self._cached_process_text(" ".join(text.split()))
         
+        # Hand out a copy so callers can't mutate the cached entry
+        if isinstance(params, dict):
+            params = dict(params)
+        return (intent, params)
+    
+    def _process_text_uncached(self, text):
+        """Determine intent and parameters without consulting the cache
+        
+        Args:
+            text (str): Normalized text to process
+            
+        Returns:
+            tuple: (intent, parameters)
+        """
         # Try pattern matching first (faster)
-        for intent, patterns in self.compiled_patterns.items():
-            for pattern in patterns:
-                match = pattern.search(text)
-                if match:
-                    # Extract parameters based on intent
-                    if intent == 'click':
-                        target = match.group(1).strip()
-                        return ('click', target)
-                    elif intent == 'type':
-                        content = match.group(1).strip()
-                        return ('type', content)
-                    elif intent == 'scroll':
-                        direction = match.group(1).lower()
-                        amount = 5  # Default
-                        if match.lastindex > 1 and match.group(2):
-                            try:
-                                amount = int(match.group(2))
-                            except ValueError:
-                                pass
-                        return ('scroll', {'direction': direction, 'amount': amount})
-                    elif intent == 'open':
-                        target = match.group(1).strip()
-                        return ('open', target)
-                    elif intent == 'help':
-                        return ('help', None)
-                    elif intent == 'exit':
-                        return ('exit', None)
+        result = self.match_patterns(text)
+        if result:
+            return result
         
         # Fall back to NLP-based intent recognition
-        return self._nlp_based_intent(doc)
+        return self._nlp_based_intent(text)
     
-    def _nlp_based_intent(self, doc):
+    def _nlp_based_intent(self, text):
         """Use NLP to determine intent when pattern matching fails
         
         Args:
-            doc: spaCy document
+            text (str): The text to process
             
         Returns:
             tuple: (intent, parameters)
         """
-        # Extract verbs and objects
-        verbs = [token.lemma_ for token in doc if token.pos_ == 'VERB']
-        objects = [token.text for token in doc if token.dep_ in ('dobj', 'pobj')]
+        # Only run the spaCy pipeline when the regex layer found nothing
+        doc = self.nlp(text)
         
-        # Map common verbs to intents
-        verb_to_intent = {
-            'click': 'click',
-            'press': 'click',
-            'select': 'click',
-            'choose': 'click',
-            'tap': 'click',
-            'type': 'type',
-            'enter': 'type',
-            'input': 'type',
-            'write': 'type',
-            'scroll': 'scroll',
-            'move': 'scroll',
-            'open': 'open',
-            'launch': 'open',
-            'start': 'open',
-            'go': 'open',
-            'navigate': 'open',
-            'help': 'help',
-            'exit': 'exit',
-            'quit': 'exit',
-            'close': 'exit'
-        }
+        # Single pass over the tokens. Object intents (click, type, open)
+        # only apply when the utterance has an object; otherwise the first
+        # scroll, help or exit verb wins.
+        first_intent = None
+        plain_intent = None
+        first_object = None
+        direction = None
+        amount = None
+        for token in doc:
+            if token.pos_ == 'VERB':
+                intent = _VERB_TO_INTENT.get(token.lemma_)
+                if intent:
+                    if first_intent is None:
+                        first_intent = intent
+                    if plain_intent is None and intent not in _OBJECT_INTENTS:
+                        plain_intent = intent
+            if first_object is None and token.dep_ in ('dobj', 'pobj'):
+                first_object = token.text
+            if direction is None and token.lower_ in ('up', 'down'):
+                direction = token.lower_
+            elif amount is None and token.pos_ == 'NUM':
+                try:
+                    amount = int(token.text)
+                except ValueError:
+                    pass
+            
+            # Nothing later in the utterance can change an object intent
+            if first_intent in _OBJECT_INTENTS and first_object is not None:
+                return (first_intent, first_object)
         
-        # Try to determine intent from verbs
-        for verb in verbs:
-            if verb in verb_to_intent:
-                intent = verb_to_intent[verb]
-                
-                # Extract parameters based on intent
-                if intent in ['click', 'type', 'open'] and objects:
-                    return (intent, objects[0])
-                elif intent == 'scroll':
-                    direction = 'down'  # Default
-                    amount = 5  # Default
-                    
-                    # Check for direction words
-                    for token in doc:
-                        if token.text.lower() in ['up', 'down']:
-                            direction = token.text.lower()
-                        elif token.pos_ == 'NUM':
-                            try:
-                                amount = int(token.text)
-                            except ValueError:
-                                pass
-                    
-                    return (intent, {'direction': direction, 'amount': amount})
-                elif intent in ['help', 'exit']:
-                    return (intent, None)
+        if plain_intent == 'scroll':
+            if direction is None:
+                direction = 'down'  # Default
+            if amount is None:
+                amount = 5  # Default
+            return (plain_intent, {'direction': direction, 'amount': amount})
+        elif plain_intent in ['help', 'exit']:
+            return (plain_intent, None)
         
         # If no intent could be determined
         return ('unknown', None)
\ No newline at end of file
@@ -1,53 +1,219 @@
 import re
+from types import MappingProxyType
+
+# Verbs that might indicate intent when no pattern matches
+_VERB_TO_INTENT = MappingProxyType({
+    'click': 'click',
+    'press': 'click',
+    'select': 'click',
+    'choose': 'click',
+    'tap': 'click',
+    'type': 'type',
+    'enter': 'type',
+    'input': 'type',
+    'write': 'type',
+    'scroll': 'scroll',
+    'move': 'scroll',
+    'open': 'open',
+    'launch': 'open',
+    'start': 'open',
+    'go': 'open',
+    'navigate': 'open',
+    'help': 'help',
+    'exit': 'exit',
+    'quit': 'exit',
+    'close': 'exit'
+})
+
+# Intents that need an object to act on
+_OBJECT_INTENTS = ('click', 'type', 'open')
+
+# Use RE2's linear-time engine for the combined intent regex when it is
+# installed. The intent patterns avoid backreferences and lookarounds, so
+# either engine accepts them.
+try:
+    import re2 as _intent_re
+except ImportError:
+    _intent_re = re
+
+def _prefix_group_names(pattern, prefix):
+    """Prefix the named groups of a pattern so they stay unique
+    
+    Args:
+        pattern (str): Regex pattern with named groups
+        prefix (str): Prefix for the group names
+        
+    Returns:
+        tuple: (rewritten pattern, dict of parameter name to group name)
+    """
+    group_names = {}
+    
+    def rename(match):
+        group_names[match.group(1)] = f"{prefix}_{match.group(1)}"
+        return f"(?P<{group_names[match.group(1)]}>"
+    
+    return re.sub(r'\(\?P<(\w+)>', rename, pattern), group_names
+
+def _compile_intent_patterns(intent_patterns):
+    """Combine every intent pattern into a single alternation
+    
+    One match() call then covers all intents. Each alternative is wrapped in
+    a named group "<intent>__<index>" and its own groups are prefixed with
+    that name so they stay unique across the alternation.
+    
+    Args:
+        intent_patterns (dict): Intent name to list of regex patterns
+        
+    Returns:
+        tuple: (compiled regex, dict of group name to (intent, group names))
+    """
+    alternatives = []
+    pattern_groups = {}
+    for intent, patterns in intent_patterns.items():
+        for i, pattern in enumerate(patterns):
+            name = f"{intent}__{i}"
+            named_pattern, group_names = _prefix_group_names(pattern, name)
+            alternatives.append(f"(?P<{name}>{named_pattern})")
+            pattern_groups[name] = (intent, group_names)
+    # Patterns are all lowercase and are matched against lowercased text
+    return _intent_re.compile("|".join(alternatives)), pattern_groups
+
+def _match_args(match, group_names, text, text_lower):
+    """Collect the parameters captured by a match against lowercased text
+    
+    Parameters are sliced from the original text so typed content and open
+    targets keep their case. If lowercasing changed the string length the
+    offsets no longer line up, so the lowercased text is used instead.
+    
+    Args:
+        match: Match object from the combined intent regex
+        group_names (dict): Parameter name to prefixed group name
+        text (str): Original text
+        text_lower (str): Lowercased text the regex was run on
+        
+    Returns:
+        dict: Captured strings, None for groups that did not participate
+    """
+    source = text if len(text) == len(text_lower) else text_lower
+    args = {}
+    for param, group_name in group_names.items():
+        start, end = match.span(group_name)
+        args[param] = source[start:end] if start >= 0 else None
+    return args
 
 class IntentProcessorFallback:
+    # Define intent patterns, shared by all instances
+    intent_patterns = {
+        'click': [
+            r'^\s*(?:click|press|tap)\s+(?:on\s+)?(?P<target>.+?)[\s.!?]*$',
+            r'^\s*(?:select|choose)\s+(?P<target>.+?)[\s.!?]*$'
+        ],
+        'type': [
+            r'^\s*(?:type|enter|input|write)\s+(?P<content>.+?)[\s.!?]*$'
+        ],
+        'scroll': [
+            r'^\s*(?:scroll|move)\s+(?P<direction>up|down)(?:\s+(?P<amount>[0-9]{1,4}))?\b'
+        ],
+        'open': [
+            r'^\s*(?:open|launch|start)\s+(?P<target>.+?)[\s.!?]*$',
+            r'^\s*(?:go|navigate)\s+to\s+(?P<target>.+?)[\s.!?]*$'
+        ],
+        'help': [
+            r'^\s*(?:help|assist|guide)\b',
+            r'^\s*what\s+can\s+you\s+do\b'
+        ],
+        'exit': [
+            r'^\s*(?:exit|quit|close|bye|goodbye)\b'
+        ]
+    }
+    
+    # Patterns are anchored at the start of the utterance and the capturing
+    # ones absorb trailing whitespace and punctuation, so the captured text
+    # needs no further stripping. They are compiled once at class load.
+    master_re, pattern_groups = _compile_intent_patterns(intent_patterns)
+    
+    # One automaton for all verbs. The lookahead reports overlapping
+    # occurrences and longer verbs are tried first at each position. RE2 has
+    # no lookarounds, so this one always uses the standard engine.
+    verb_re = re.compile("(?=(" + "|".join(
+        map(re.escape, sorted(_VERB_TO_INTENT, key=len, reverse=True))) + "))")
+    
     def __init__(self):
         """Initialize the intent processor with regex patterns only (no spacy dependency)"""
-        # Define intent patterns
-        self.intent_patterns = {
-            'click': [
-                r'click\s+(?:on\s+)?(.+)',
-                r'press\s+(?:on\s+)?(.+)',
-                r'select\s+(.+)',
-                r'choose\s+(.+)',
-                r'tap\s+(?:on\s+)?(.+)'
-            ],
-            'type': [
-                r'type\s+(.+)',
-                r'enter\s+(.+)',
-                r'input\s+(.+)',
-                r'write\s+(.+)'
-            ],
-            'scroll': [
-                r'scroll\s+(up|down)(?:\s+(\d+))?',
-                r'move\s+(up|down)(?:\s+(\d+))?'
-            ],
-            'open': [
-                r'open\s+(.+)',
-                r'launch\s+(.+)',
-                r'start\s+(.+)',
-                r'go\s+to\s+(.+)',
-                r'navigate\s+to\s+(.+)'
-            ],
-            'help': [
-                r'help',
-                r'assist',
-                r'guide',
-                r'what\s+can\s+you\s+do'
-            ],
-            'exit': [
-                r'exit',
-                r'quit',
-                r'close',
-                r'bye',
-                r'goodbye'
-            ]
+        # Parameter extraction per intent
+        self.param_extractors = {
+            'click': self._extract_target,
+            'type': self._extract_content,
+            'scroll': self._extract_scroll,
+            'open': self._extract_target,
+            'help': self._extract_none,
+            'exit': self._extract_none
         }
+    
+    def _extract_target(self, intent, args):
+        """Return the captured target as the intent parameter"""
+        return (intent, args['target'])
+    
+    def _extract_content(self, intent, args):
+        """Return the captured content as the intent parameter"""
+        return (intent, args['content'])
+    
+    def _extract_scroll(self, intent, args):
+        """Return direction and amount captured by a scroll pattern
         
-        # Compile regex patterns
-        self.compiled_patterns = {}
-        for intent, patterns in self.intent_patterns.items():
-            self.compiled_patterns[intent] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        The amount group only matches one to four ASCII digits, so int()
+        cannot fail and never parses an oversized number from noisy speech
+        input. Longer digit runs leave the default amount in place.
+        """
+        direction = args['direction'].lower()
+        amount = int(args['amount']) if args['amount'] else 5  # Default
+        return (intent, {'direction': direction, 'amount': amount})
+    
+    def _extract_none(self, intent, args):
+        """Intents such as help and exit take no parameters"""
+        return (intent, None)
+    
+    def _keyword_params(self, intent, following, text_lower):
+        """Build the result for a verb found by the keyword fallback
+        
+        Args:
+            intent (str): Intent the verb maps to
+            following (str): Whole word after the verb, or None
+            text_lower (str): Lowercased utterance
+            
+        Returns:
+            tuple: (intent, parameters), or None if the verb needs an object
+            and has none
+        """
+        if intent in _OBJECT_INTENTS:
+            return (intent, following) if following else None
+        
+        # Default parameters for intents that don't need objects
+        if intent == 'scroll':
+            direction = 'down'  # Default
+            if 'up' in text_lower:
+                direction = 'up'
+            return (intent, {'direction': direction, 'amount': 5})
+        return (intent, None)
+    
+    def match_patterns(self, text):
+        """Match text against the anchored intent patterns only
+        
+        Args:
+            text (str): The text to process
+            
+        Returns:
+            tuple: (intent, parameters), or None if no pattern matches
+        """
+        text_lower = text.lower()
+        match = self.master_re.match(text_lower)
+        if not match:
+            return None
+        
+        # The outer named group of the matching alternative closes last
+        intent, group_names = self.pattern_groups[match.lastgroup]
+        args = _match_args(match, group_names, text, text_lower)
+        return self.param_extractors[intent](intent, args)
     
     def process_text(self, text):
         """Process text to determine intent and extract parameters
@@ -59,78 +225,40 @@ class IntentProcessorFallback:
             tuple: (intent, parameters)
         """
         # Try pattern matching
-        for intent, patterns in self.compiled_patterns.items():
-            for pattern in patterns:
-                match = pattern.search(text)
-                if match:
-                    # Extract parameters based on intent
-                    if intent == 'click':
-                        target = match.group(1).strip()
-                        return ('click', target)
-                    elif intent == 'type':
-                        content = match.group(1).strip()
-                        return ('type', content)
-                    elif intent == 'scroll':
-                        direction = match.group(1).lower()
-                        amount = 5  # Default
-                        if match.lastindex > 1 and match.group(2):
-                            try:
-                                amount = int(match.group(2))
-                            except ValueError:
-                                pass
-                        return ('scroll', {'direction': direction, 'amount': amount})
-                    elif intent == 'open':
-                        target = match.group(1).strip()
-                        return ('open', target)
-                    elif intent == 'help':
-                        return ('help', None)
-                    elif intent == 'exit':
-                        return ('exit', None)
+        result = self.match_patterns(text)
+        if result:
+            return result
         
-        # Simple keyword-based fallback
         text_lower = text.lower()
         
-        # Check for verbs that might indicate intent
-        verb_to_intent = {
-            'click': 'click',
-            'press': 'click',
-            'select': 'click',
-            'choose': 'click',
-            'tap': 'click',
-            'type': 'type',
-            'enter': 'type',
-            'input': 'type',
-            'write': 'type',
-            'scroll': 'scroll',
-            'move': 'scroll',
-            'open': 'open',
-            'launch': 'open',
-            'start': 'open',
-            'go': 'open',
-            'navigate': 'open',
-            'help': 'help',
-            'exit': 'exit',
-            'quit': 'exit',
-            'close': 'exit'
-        }
+        # Simple keyword-based fallback. Voice commands almost always lead
+        # with the verb, so try the first word with a dict lookup before
+        # scanning the whole text.
+        words = text_lower.split(None, 2)
+        if words and words[0] in _VERB_TO_INTENT:
+            following = words[1] if len(words) > 1 else None
+            result = self._keyword_params(_VERB_TO_INTENT[words[0]], following, text_lower)
+            if result:
+                return result
         
-        for verb, intent in verb_to_intent.items():
-            if verb in text_lower:
-                # Very simple object extraction (words after the verb)
-                words = text_lower.split()
-                if verb in words and words.index(verb) < len(words) - 1:
-                    potential_object = words[words.index(verb) + 1]
-                    if intent in ['click', 'type', 'open']:
-                        return (intent, potential_object)
-                
-                # Default parameters for intents that don't need objects
-                if intent == 'scroll':
-                    direction = 'down'  # Default
-                    if 'up' in text_lower:
-                        direction = 'up'
-                    return (intent, {'direction': direction, 'amount': 5})
-                elif intent in ['help', 'exit']:
-                    return (intent, None)
+        # Single pass over the text for every verb occurrence, in order of
+        # position. Matches may be partial words (e.g. "help" in "helpful").
+        for match in self.verb_re.finditer(text_lower):
+            intent = _VERB_TO_INTENT[match.group(1)]
+            start, end = match.start(1), match.end(1)
+            
+            # Very simple object extraction (the word after the verb)
+            following = None
+            is_word = ((start == 0 or text_lower[start - 1].isspace()) and
+                       (end == len(text_lower) or text_lower[end].isspace()))
+            if is_word and intent in _OBJECT_INTENTS:
+                rest = text_lower[end:].split(None, 1)
+                if rest:
+                    following = rest[0]
+            
+            result = self._keyword_params(intent, following, text_lower)
+            if result:
+                return result
         
         # If no intent could be determined
         return ('unknown', None)
\ No newline at end of file
@@ -1,9 +1,11 @@
 # First import only the setup_logger and initialize it immediately
 from utils.logger import setup_logger
 import os
+import re
 import sys
 import time
 import signal
+import threading
 
 # Initialize the global logger
 logger = setup_logger()
@@ -17,20 +19,42 @@ from utils.config import Config
 from modules.screen_reader import ScreenReader
 from speech_handler import SpeechHandler
 
-# Import intent processor
-try:
-    from ollama_intent_processor import OllamaIntentProcessor
-    print("Using Ollama-based intent processor")
-except ImportError:
-    print("Ollama intent processor not available, trying spaCy")
+def _get_intent_processor(config):
+    """Create the best available intent processor
+    
+    Backends are imported only when first needed, in order of preference:
+    Ollama, then spaCy, then the regex-only fallback.
+    
+    Args:
+        config (Config): Configuration manager
+        
+    Returns:
+        Intent processor instance
+    """
     try:
-        from intent_processor import IntentProcessor
-        print("Using spaCy-based intent processor")
+        from ollama_intent_processor import OllamaIntentProcessor
+        processor = OllamaIntentProcessor(config)
+        logger.info("Using Ollama-based intent processor")
+        return processor
     except ImportError:
-        print("spaCy not available, using fallback intent processor")
-        from intent_processor_fallback import IntentProcessorFallback as IntentProcessor
+        logger.info("Ollama intent processor not available, trying spaCy")
+    
+    try:
+        from intent_processor import IntentProcessor
+        processor = IntentProcessor()
+        logger.info("Using spaCy-based intent processor")
+        return processor
+    except (ImportError, OSError):
+        # OSError covers a missing en_core_web_sm model
+        logger.info("spaCy not available, using fallback intent processor")
+    
+    from intent_processor_fallback import IntentProcessorFallback
+    return IntentProcessorFallback()
 
 class BuddyApp:
+    # Targets that look like a website address
+    _DOMAIN_RE = re.compile(r'\.(?:com|org|net|io)\b', re.IGNORECASE)
+    
     def __init__(self):
         """Initialize Buddy application"""
         self.logger = setup_logger()
@@ -44,20 +68,23 @@ class BuddyApp:
         self.input_controller = InputController(self.config)
         logger.info("Input controller initialized")
         
-        # Command processing flag
+        # Command processing flag and the event the main thread blocks on
         self.running = True
+        self._shutdown_evt = threading.Event()
         
-        # Initialize intent processor
-        try:
-            self.intent_processor = OllamaIntentProcessor(self.config)
-            logger.info("Ollama intent processor initialized")
-        except NameError:
-            try:
-                self.intent_processor = IntentProcessor()
-                logger.info("Fallback intent processor initialized")
-            except Exception as e:
-                logger.error(f"Error initializing intent processor: {e}")
-                self.intent_processor = None
+        # Intent to handler jump table for command execution
+        self._dispatch = {
+            'click': self._do_click,
+            'type': self._do_type,
+            'scroll': self._do_scroll,
+            'open': self._do_open,
+            'help': self._do_help,
+            'exit': self._do_exit
+        }
+        
+        # The intent processor is created on the first utterance so startup
+        # doesn't pay for importing and loading an NLP backend
+        self.intent_processor = None
         
         # Initialize speech handler
         self.speech_handler = SpeechHandler(self.handle_speech)
@@ -82,9 +109,8 @@ class BuddyApp:
             return
         
         try:
-            # Main loop
-            while self.running:
-                time.sleep(0.1)  # Prevent CPU hogging
+            # Block until a shutdown signal or exit command arrives
+            self._shutdown_evt.wait()
                 
         except Exception as e:
             logger.error(f"Error in main loop: {e}")
@@ -111,9 +137,13 @@ class BuddyApp:
         """
         logger.debug(f"Processing natural language: {text}")
         
-        if not self.intent_processor:
-            print("Sorry, natural language processing is not available.")
-            return
+        if self.intent_processor is None:
+            try:
+                self.intent_processor = _get_intent_processor(self.config)
+            except Exception as e:
+                logger.error(f"Error initializing intent processor: {e}")
+                print("Sorry, natural language processing is not available.")
+                return
         
         # Use intent processor to determine intent and parameters
         intent, params = self.intent_processor.process_text(text)
@@ -144,25 +174,48 @@ class BuddyApp:
     
     def _execute_command(self, intent, params):
         """Execute a command based on intent and parameters"""
+        handler = self._dispatch.get(intent)
+        if not handler:
+            return
         try:
-            if intent == 'click':
-                self._execute_action('click', params)
-            elif intent == 'type':
-                self._execute_action('type', params)
-            elif intent == 'scroll':
-                direction = params.get('direction', 'down') if isinstance(params, dict) else 'down'
-                amount = params.get('amount', 5) if isinstance(params, dict) else 5
-                self._execute_action('scroll', f"{amount} {direction}")
-            elif intent == 'open':
-                self._handle_open_intent(params)
-            elif intent == 'help':
-                self._show_help()
-            elif intent == 'exit':
-                self._exit_application()
+            handler(params)
         except Exception as e:
             logger.error(f"Error executing command: {e}")
             self.speech_handler.speak("Sorry, I encountered an error executing that command.")
     
+    def _do_click(self, params):
+        """Execute the click intent"""
+        self._execute_action('click', params)
+    
+    def _do_type(self, params):
+        """Execute the type intent"""
+        self._execute_action('type', params)
+    
+    def _do_scroll(self, params):
+        """Execute the scroll intent
+        
+        The intent processors already extract a numeric amount and a
+        direction, so they go straight to the input controller.
+        """
+        direction = 'down'
+        amount = 5
+        if isinstance(params, dict):
+            direction = str(params.get('direction', direction)).lower()
+            amount = params.get('amount', amount)
+        self.input_controller.scroll(int(amount), direction)
+    
+    def _do_open(self, params):
+        """Execute the open intent"""
+        self._handle_open_intent(params)
+    
+    def _do_help(self, params):
+        """Execute the help intent"""
+        self._show_help()
+    
+    def _do_exit(self, params):
+        """Execute the exit intent"""
+        self._exit_application()
+    
     def _execute_action(self, action_type, action_args):
         """Execute an action with the given type and arguments"""
         if action_type == "click":
@@ -179,26 +232,11 @@ class BuddyApp:
             
         elif action_type == "key":
             self.input_controller.press_key(action_args)
-            
-        elif action_type == "scroll":
-            direction = "down"
-            amount = 5
-            if action_args:
-                parts = str(action_args).split()
-                if len(parts) >= 1:
-                    try:
-                        amount = int(parts[0])
-                    except ValueError:
-                        direction = parts[0].lower()
-                if len(parts) >= 2:
-                    direction = parts[1].lower()
-            
-            self.input_controller.scroll(amount, direction)
     
     def _handle_open_intent(self, target):
         """Handle the open intent with special processing"""
         # Check if it's a website
-        if any(domain in str(target).lower() for domain in [".com", ".org", ".net", ".io"]):
+        if self._DOMAIN_RE.search(str(target)):
             # Open browser and navigate
             self._execute_action("key", "command")
             self._execute_action("type", "space")
@@ -229,13 +267,16 @@ class BuddyApp:
     
     def _exit_application(self):
         """Exit the application"""
-        self.speech_handler.speak("Goodbye!")
+        self.speech_handler.speak("Goodbye!", priority=True)
+        self.speech_handler.finish_speaking()
         self.running = False
+        self._shutdown_evt.set()
     
     def handle_shutdown(self, signum, frame):
         """Handle shutdown signals"""
         logger.info(f"Received shutdown signal {signum}")
         self.running = False
+        self._shutdown_evt.set()
     
     def cleanup(self):
         """Clean up resources"""
@@ -244,6 +285,8 @@ class BuddyApp:
             self.speech_handler.cleanup()
         if hasattr(self, 'intent_processor') and hasattr(self.intent_processor, 'shutdown'):
             self.intent_processor.shutdown()
+        if hasattr(self, 'config'):
+            self.config.flush()
         logger.info("Cleanup complete")
 
 def main():
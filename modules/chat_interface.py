@@ -1,9 +1,46 @@
+# Free-threading safe: shared history is only touched through single deque
+# operations, which are atomic with or without the GIL
+import io
 import wx
+import asyncio
 import threading
-import queue
+import collections
 from loguru import logger
 from speech_handler import SpeechHandler  # Add this import
 
+# Reply to /help in test mode
+_HELP_TEXT = (
+    "Available commands:\n"
+    "/click [element] - Click on a UI element\n"
+    "/type [text] - Type the specified text\n"
+    "/key [keyname] - Press a specific key\n"
+    "/find [element] - Find a UI element\n"
+    "/scroll [amount] [up/down] - Scroll the page\n"
+    "/screenshot - Take a screenshot\n"
+    "/exit or /quit - Exit the application"
+)
+
+# Fonts keyed by (size, family, style, weight); built once per process
+_FONT_CACHE = {}
+
+def _get_font(size, family, style, weight):
+    """Return a cached wx.Font, creating it on first use.
+    
+    Args:
+        size (int): Point size
+        family (int): wx font family
+        style (int): wx font style
+        weight (int): wx font weight
+        
+    Returns:
+        wx.Font: Shared font instance
+    """
+    key = (size, family, style, weight)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        font = _FONT_CACHE[key] = wx.Font(size, family, style, weight)
+    return font
+
 class ChatInterface:
     """Provides text-based command input and feedback using wxPython.
     
@@ -14,16 +51,20 @@ class ChatInterface:
     Attributes:
         command_callback (callable): Function to process user commands
         config (dict): Configuration settings for the interface
-        message_history (list): List of (sender, message) tuples
+        message_history (deque): Bounded deque of (sender, message) tuples
         speech_handler (SpeechHandler): Handles voice input/output
     """
     
+    # Display prefixes for the usual senders, built once
+    _SENDER_PREFIXES = {"You": "You: ", "Buddy": "Buddy: ", "System": "System: "}
+    
     def __init__(self, command_callback=None, config=None):
         try:
+            # Guards the pending command count
             self._lock = threading.Lock()
-            self.message_history = []
-            self.command_queue = queue.Queue()
             self.command_callback = command_callback
+            # Resolve the command handler once; test mode has no callback
+            self._dispatch = command_callback or self._handle_test_commands
             self.shutdown_event = threading.Event()
             
             # Initialize speech_handler as None
@@ -32,13 +73,24 @@ class ChatInterface:
             # Load configuration with validation
             self._load_config(config)
             
+            # Bounded history; the oldest message drops off in O(1). Single
+            # append/clear calls are atomic, so the history needs no lock
+            self.message_history = collections.deque(maxlen=self.max_history)
+            
             # Initialize components with error handling
             self._setup_ui()
             
-            # Start command processing thread
-            self.command_thread = threading.Thread(target=self._process_commands)
-            self.command_thread.daemon = True
-            self.command_thread.start()
+            # Commands scheduled but not yet finished, capped at queue_max
+            self._pending_commands = 0
+            
+            # Commands run as coroutines on one event loop thread, so they
+            # execute in the order they were entered; input automation
+            # depends on that
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name="buddy-cmd", daemon=True
+            )
+            self._loop_thread.start()
             
         except Exception as e:
             self.cleanup()
@@ -55,18 +107,15 @@ class ChatInterface:
             except Exception as e:
                 logger.error(f"Error closing speech handler: {e}")
         
-        if hasattr(self, 'command_queue'):
-            try:
-                self.command_queue.put(None)  # Signal shutdown
-                self.command_queue.join(timeout=2)
-            except Exception as e:
-                logger.error(f"Error cleaning up command queue: {e}")
-        
-        if hasattr(self, 'command_thread') and self.command_thread.is_alive():
+        if hasattr(self, '_loop') and not self._loop.is_closed():
             try:
-                self.command_thread.join(timeout=2)
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                if hasattr(self, '_loop_thread') and self._loop_thread.is_alive():
+                    self._loop_thread.join(timeout=2)
+                if not self._loop.is_running():
+                    self._loop.close()
             except Exception as e:
-                logger.error(f"Error joining command thread: {e}")
+                logger.error(f"Error stopping command loop: {e}")
         
         if hasattr(self, 'frame'):
             try:
@@ -74,47 +123,43 @@ class ChatInterface:
             except Exception as e:
                 logger.error(f"Error destroying frame: {e}")
 
-    def _process_commands(self):
-        """Process commands in a background thread with improved error handling"""
-        while not self.shutdown_event.is_set():
-            try:
-                command = self.command_queue.get(timeout=1)
-                if command is None:  # Shutdown signal
-                    break
-                if self.command_callback:
-                    self.command_callback(command)
-                else:
-                    self._handle_test_commands(command)
-                self.command_queue.task_done()
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error processing command: {e}")
-                time.sleep(1)
+    async def _handle_cmd_async(self, command):
+        """Run a single command on the command loop
+        
+        The callback is ordinary blocking code, so it runs inline and the
+        next command starts only once this one has finished.
+        
+        Args:
+            command (str): User command
+        """
+        try:
+            self._dispatch(command)
+        except Exception as e:
+            logger.error(f"Error processing command: {e}")
+        finally:
+            with self._lock:
+                self._pending_commands -= 1
+    
+    def _cmd_help(self, name, args):
+        """Show the list of slash commands"""
+        self.display_message(_HELP_TEXT, "Buddy")
+    
+    def _cmd_echo(self, name, args):
+        """Acknowledge a slash command that test mode doesn't execute"""
+        self.display_message(f"Received command: {name} with args: {args}", "Buddy")
+    
+    # Slash command name to test-mode handler; anything else is echoed
+    _COMMANDS = {"help": _cmd_help}
     
     def _handle_test_commands(self, command):
         """Handle commands in test mode when no callback is provided"""
-        if command.startswith("/"):
-            parts = command[1:].split(" ", 1)
-            cmd_type = parts[0].lower()
-            cmd_args = parts[1] if len(parts) > 1 else ""
-            
-            if cmd_type == "help":
-                self.display_message(
-                    "Available commands:\n"
-                    "/click [element] - Click on a UI element\n"
-                    "/type [text] - Type the specified text\n"
-                    "/key [keyname] - Press a specific key\n"
-                    "/find [element] - Find a UI element\n"
-                    "/scroll [amount] [up/down] - Scroll the page\n"
-                    "/screenshot - Take a screenshot\n"
-                    "/exit or /quit - Exit the application", 
-                    "Buddy"
-                )
-            else:
-                self.display_message(f"Received command: {cmd_type} with args: {cmd_args}", "Buddy")
-        else:
+        if not command.startswith("/"):
             self.display_message("Processing your natural language request...", "Buddy")
+            return
+        
+        name, _, args = command[1:].partition(" ")
+        name = name.lower()
+        self._COMMANDS.get(name, ChatInterface._cmd_echo)(self, name, args)
     
     def _load_config(self, config):
         """Load and validate configuration settings.
@@ -127,6 +172,7 @@ class ChatInterface:
         self.window_height = 400
         self.font_size = 10
         self.max_history = 100
+        self.queue_max = 256
         
         if config:
             try:
@@ -135,6 +181,7 @@ class ChatInterface:
                 self.window_height = max(400, chat_config.get('window_height', 400))
                 self.font_size = max(8, chat_config.get('font_size', 10))
                 self.max_history = max(50, chat_config.get('max_history', 100))
+                self.queue_max = max(1, chat_config.get('queue_max', 256))
             except Exception as e:
                 logger.error(f"Config loading error: {e}")
                 # Use defaults if config loading fails
@@ -147,40 +194,82 @@ class ChatInterface:
             sender (str): Message sender
         """
         try:
-            with self._lock:
-                # Format and validate message
-                if not isinstance(message, str):
-                    message = str(message)
-                formatted_message = f"{sender}: {message}\n"
-                
-                # Update history safely
-                self.message_history.append((sender, message))
-                if len(self.message_history) > self.max_history:
-                    self.message_history = self.message_history[-self.max_history:]
-                
-                # Update UI safely
-                wx.CallAfter(self._safe_append_text, formatted_message)
-                
-                # Handle text-to-speech
-                if sender == "Buddy" and self.speech_handler:
-                    try:
-                        self.speech_handler.speak(message)
-                    except Exception as e:
-                        logger.error(f"TTS error: {e}")
-                
-                logger.debug(f"Message from {sender}: {message}")
-                
+            # Format and validate message
+            if not isinstance(message, str):
+                message = str(message)
+            
+            self.message_history.append((sender, message))
+            
+            # Update UI safely
+            wx.CallAfter(self._safe_append_text, message, sender)
+            
+            # Handle text-to-speech. speak() only enqueues; synthesis runs on
+            # the speech handler's own TTS thread, off the UI and lock paths
+            if sender == "Buddy" and self.speech_handler:
+                try:
+                    self.speech_handler.speak(message)
+                except Exception as e:
+                    logger.error(f"TTS error: {e}")
+            
+            logger.debug("Message from {}: {}", sender, message)
+            
         except Exception as e:
             logger.error(f"Error displaying message: {e}")
             # Attempt to display error message
             wx.CallAfter(self._safe_append_text, "Error displaying message\n")
     
-    def _safe_append_text(self, text):
-        """Safely append text to chat display."""
+    def _safe_append_text(self, text, sender=None):
+        """Queue text for the chat display.
+        
+        Runs on the UI thread via wx.CallAfter. Text is written into a
+        reused buffer and flushed by _flush_text once per frame, so a burst
+        of messages costs a single AppendText.
+        
+        Args:
+            text (str): Message or raw text to append
+            sender (str, optional): Message sender; None appends text as is
+        """
         try:
-            self.chat_display.AppendText(text)
+            if sender is not None:
+                self._pending_text.write(self._SENDER_PREFIXES.get(sender) or f"{sender}: ")
+                self._pending_text.write(text)
+                self._pending_text.write("\n")
+            else:
+                self._pending_text.write(text)
+            if not self._flush_timer.IsRunning():
+                self._flush_timer.Start(16, wx.TIMER_ONE_SHOT)
         except Exception as e:
             logger.error(f"Error updating chat display: {e}")
+    
+    def _flush_text(self, event=None):
+        """Write all pending text to the chat display in one update.
+        
+        Nothing is painted while the frame is hidden or minimized; the text
+        stays pending until _on_frame_shown flushes it.
+        """
+        if not self.frame.IsShownOnScreen():
+            return
+        text = self._pending_text.getvalue()
+        if not text:
+            return
+        self._reset_pending_text()
+        try:
+            with wx.WindowUpdateLocker(self.chat_display):
+                self.chat_display.AppendText(text)
+        except Exception as e:
+            logger.error(f"Error updating chat display: {e}")
+
+    def _on_frame_shown(self, event):
+        """Flush text that arrived while the frame was hidden or minimized"""
+        event.Skip()
+        restored = event.IsShown() if event.GetEventType() == wx.wxEVT_SHOW else not event.IsIconized()
+        if restored:
+            wx.CallAfter(self._flush_text)
+    
+    def _reset_pending_text(self):
+        """Empty the pending text buffer while keeping it for reuse."""
+        self._pending_text.seek(0)
+        self._pending_text.truncate(0)
 
     def _setup_ui(self):
         """Set up the chat interface UI using wxPython"""
@@ -205,10 +294,25 @@ class ChatInterface:
             size=(-1, -1)
         )
         self.chat_display.SetBackgroundColour(wx.Colour(255, 255, 255))  # White background
-        font = wx.Font(self.font_size, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+        # Double-buffer the display and its panel so each batched append is
+        # blitted once instead of painting every intermediate step
+        self.chat_display.SetDoubleBuffered(True)
+        panel.SetDoubleBuffered(True)
+        font = _get_font(self.font_size, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
         self.chat_display.SetFont(font)
         main_sizer.Add(self.chat_display, proportion=1, flag=wx.EXPAND | wx.ALL, border=10)
         
+        # Pending chat text, flushed to the display by a one-shot timer
+        self._pending_text = io.StringIO()
+        self._flush_timer = wx.Timer(self.frame)
+        self.frame.Bind(wx.EVT_TIMER, self._flush_text, self._flush_timer)
+        self.frame.Bind(wx.EVT_SHOW, self._on_frame_shown)
+        self.frame.Bind(wx.EVT_ICONIZE, self._on_frame_shown)
+        
+        # Releases the speech handler once voice input has been off a while
+        self._voice_idle_timer = wx.Timer(self.frame)
+        self.frame.Bind(wx.EVT_TIMER, self._release_speech_handler, self._voice_idle_timer)
+        
         # Input area with modern styling
         input_sizer = wx.BoxSizer(wx.HORIZONTAL)
         
@@ -221,7 +325,7 @@ class ChatInterface:
         
         # Voice input toggle button with modern styling
         self.voice_button = wx.ToggleButton(panel, label="🎤")
-        self.voice_button.SetFont(wx.Font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        self.voice_button.SetFont(_get_font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
         self.voice_button.SetBackgroundColour(wx.Colour(230, 230, 230))
         self.voice_button.Bind(wx.EVT_TOGGLEBUTTON, self._on_voice_toggle)
         input_sizer.Add(self.voice_button, proportion=0, flag=wx.RIGHT | wx.ALIGN_CENTER_VERTICAL, border=5)
@@ -239,7 +343,7 @@ class ChatInterface:
         # Help text with improved styling
         help_text = "Type commands like: /click 'button name', /type 'text', /find 'element'"
         help_label = wx.StaticText(panel, label=help_text)
-        help_label.SetFont(wx.Font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL))
+        help_label.SetFont(_get_font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL))
         help_label.SetForegroundColour(wx.Colour(100, 100, 100))  # Dark gray text
         main_sizer.Add(help_label, proportion=0, flag=wx.ALIGN_CENTER | wx.ALL, border=5)
         
@@ -256,25 +360,6 @@ class ChatInterface:
         
         # Focus on input field
         self.input_field.SetFocus()
-        
-        # Start a thread to process commands in the background
-        command_thread = threading.Thread(target=self._process_commands)
-        command_thread.daemon = True
-        command_thread.start()
-        
-        # Show the frame
-        self.frame.Show()
-    
-    def _process_commands(self):
-        """Process commands in a background thread"""
-        while True:
-            try:
-                command = self.command_queue.get()
-                if self.command_callback:
-                    self.command_callback(command)
-                self.command_queue.task_done()
-            except Exception as e:
-                logger.error(f"Error processing command: {e}")
     
     def run(self):
         """Run the wxPython main loop"""
@@ -298,27 +383,6 @@ class ChatInterface:
             # Process command
             self.process_command(user_input)
     
-    def display_message(self, message, sender):
-        """Add message to chat history and update UI"""
-        # Format message with sender
-        formatted_message = f"{sender}: {message}\n"
-        
-        # Add to history
-        self.message_history.append((sender, message))
-        
-        # Trim history if needed
-        if len(self.message_history) > self.max_history:
-            self.message_history = self.message_history[-self.max_history:]
-        
-        # Update UI
-        self.chat_display.AppendText(formatted_message)
-        
-        # Speak Buddy's responses
-        if sender == "Buddy" and self.speech_handler:
-            self.speech_handler.speak(message)
-        
-        logger.debug(f"Message from {sender}: {message}")
-    
     def _handle_speech(self, text):
         """Handle recognized speech"""
         if text:
@@ -334,61 +398,49 @@ class ChatInterface:
                 wx.CallAfter(self._on_send, None)
     
     def process_command(self, command):
-        """Process user command and queue for execution
+        """Process user command and schedule it on the command loop
+        
+        At most queue_max commands may be waiting or running at once.
+        Further commands are dropped with a warning rather than queued, so
+        a burst of voice input cannot grow memory without bound; the cost is
+        that commands in such a burst are lost.
         
         Args:
             command (str): User command
-        """
-        # Add to command queue
-        self.command_queue.put(command)
-        
-        # Only use this for testing when no callback is provided
-        if not self.command_callback:
-            # Simple command parsing for testing
-            if command.startswith("/"):
-                parts = command[1:].split(" ", 1)
-                cmd_type = parts[0].lower()
-                
-                if len(parts) > 1:
-                    cmd_args = parts[1]
-                else:
-                    cmd_args = ""
-                
-                # Simple response based on command type
-                if cmd_type == "help":
-                    self.display_message(
-                        "Available commands:\n"
-                        "/click [element] - Click on a UI element\n"
-                        "/type [text] - Type the specified text\n"
-                        "/key [keyname] - Press a specific key\n"
-                        "/find [element] - Find a UI element\n"
-                        "/scroll [amount] [up/down] - Scroll the page\n"
-                        "/screenshot - Take a screenshot\n"
-                        "/exit or /quit - Exit the application", 
-                        "Buddy"
-                    )
-                else:
-                    self.display_message(f"Received command: {cmd_type} with args: {cmd_args}", "Buddy")
-            else:
-                self.display_message("Processing your natural language request...", "Buddy")
-    
-    def get_user_input(self):
-        """Get next command from queue (blocking)
-        
+            
         Returns:
-            str: User command
+            concurrent.futures.Future: Completes when the command has run,
+            or None if it was dropped
         """
-        return self.command_queue.get()
+        with self._lock:
+            if self._pending_commands >= self.queue_max:
+                logger.warning(f"Command queue full, dropping: {command}")
+                return None
+            self._pending_commands += 1
+        
+        try:
+            return asyncio.run_coroutine_threadsafe(self._handle_cmd_async(command), self._loop)
+        except RuntimeError:
+            with self._lock:
+                self._pending_commands -= 1
+            logger.warning(f"Ignoring command after shutdown: {command}")
+            return None
     
     def clear_history(self):
         """Clear chat history"""
-        self.message_history = []
+        self.message_history.clear()
+        self._reset_pending_text()
         self.chat_display.Clear()
         self.display_message("Chat history cleared", "Buddy")
         logger.info("Chat history cleared")
     
+    # How long a deactivated speech handler is kept for reuse (ms)
+    _VOICE_IDLE_MS = 30000
+    
     def _on_voice_toggle(self, event):
         if event.IsChecked():
+            # Reuse a handler still inside its idle window
+            self._voice_idle_timer.Stop()
             if not self.speech_handler:
                 self.speech_handler = SpeechHandler(self._handle_speech)
             self.speech_handler.start_listening()
@@ -396,8 +448,19 @@ class ChatInterface:
         else:
             if self.speech_handler:
                 self.speech_handler.stop_listening()
+                self._voice_idle_timer.Start(self._VOICE_IDLE_MS, wx.TIMER_ONE_SHOT)
             self.display_message("Voice input deactivated", "System")
     
+    def _release_speech_handler(self, event=None):
+        """Close the idle speech handler and free its audio devices"""
+        if self.speech_handler and not self.voice_button.GetValue():
+            try:
+                self.speech_handler.close()
+            except Exception as e:
+                logger.error(f"Error closing speech handler: {e}")
+            self.speech_handler = None
+            logger.info("Released idle speech handler")
+    
     def close(self):
         """Clean up and close the interface"""
         if self.speech_handler:
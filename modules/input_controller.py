@@ -1,7 +1,87 @@
+import sys
+import numpy as np
 import pyautogui
 import time
 from loguru import logger
 
+try:
+    import pyperclip  # installed with pyautogui via mouseinfo
+except ImportError:
+    pyperclip = None
+
+# Uncached screen size query, kept so the cache can be refreshed
+_query_screen_size = pyautogui.size
+
+# Modifier for the paste shortcut
+_PASTE_MODIFIER = 'command' if sys.platform == 'darwin' else 'ctrl'
+
+try:
+    import Quartz  # installed with pyautogui on macOS
+except ImportError:
+    Quartz = None
+
+# Mouse move events per second for smooth movement
+_MOVE_RATE = 60
+
+# Unpaced text longer than this is pasted rather than typed key by key
+_PASTE_THRESHOLD = 50
+
+class _QuartzBackend:
+    """Posts a move and click as one batch of CoreGraphics events (macOS)"""
+    
+    def __init__(self):
+        self._buttons = {
+            'left': (Quartz.kCGMouseButtonLeft, Quartz.kCGEventLeftMouseDown, Quartz.kCGEventLeftMouseUp),
+            'right': (Quartz.kCGMouseButtonRight, Quartz.kCGEventRightMouseDown, Quartz.kCGEventRightMouseUp),
+            'middle': (Quartz.kCGMouseButtonCenter, Quartz.kCGEventOtherMouseDown, Quartz.kCGEventOtherMouseUp),
+        }
+    
+    def schedule_move(self, xs, ys, ts):
+        """Post mouse move events along a precomputed path
+        
+        Each event is posted at its absolute offset from the start, so
+        sleep overshoot doesn't accumulate over the move. pyautogui's
+        fail-safe is checked before every step, as its own moveTo does.
+        
+        Args:
+            xs (ndarray): X coordinates
+            ys (ndarray): Y coordinates
+            ts (ndarray): Seconds from the start at which to post each point
+        """
+        start = time.perf_counter()
+        for x, y, t in zip(xs.tolist(), ys.tolist(), ts.tolist()):
+            delay = start + t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pyautogui.failSafeCheck()
+            event = Quartz.CGEventCreateMouseEvent(
+                None, Quartz.kCGEventMouseMoved, (x, y), Quartz.kCGMouseButtonLeft
+            )
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+    
+    def move_click(self, x, y, button="left", double=False):
+        """Move to (x, y) and click without returning to Python in between
+        
+        pyautogui's fail-safe is checked once before the batch is posted.
+        
+        Args:
+            x (int): X coordinate
+            y (int): Y coordinate
+            button (str, optional): Mouse button. Defaults to "left".
+            double (bool, optional): Double click. Defaults to False.
+        """
+        cg_button, down_type, up_type = self._buttons[button]
+        point = (x, y)
+        events = [Quartz.CGEventCreateMouseEvent(None, Quartz.kCGEventMouseMoved, point, cg_button)]
+        for click_state in ((1, 2) if double else (1,)):
+            for event_type in (down_type, up_type):
+                event = Quartz.CGEventCreateMouseEvent(None, event_type, point, cg_button)
+                Quartz.CGEventSetIntegerValueField(event, Quartz.kCGMouseEventClickState, click_state)
+                events.append(event)
+        pyautogui.failSafeCheck()
+        for event in events:
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+
 class InputController:
     """Controls mouse and keyboard actions"""
     
@@ -13,11 +93,15 @@ class InputController:
         """
         # Set PyAutoGUI settings
         pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+        pyautogui.PAUSE = 0  # Delays are explicit (click_delay, type_interval)
         
         # Get screen dimensions
-        self.screen_width, self.screen_height = pyautogui.size()
+        self.refresh_screen_size()
         logger.info(f"Screen resolution: {self.screen_width}x{self.screen_height}")
         
+        # Native event backend for instant move+click, where available
+        self._backend = _QuartzBackend() if Quartz is not None else None
+        
         # Load configuration
         self.config = config
         self.move_duration = 0.5
@@ -29,6 +113,22 @@ class InputController:
             self.click_delay = config.get('input_controller', {}).get('click_delay', 0.1)
             self.type_interval = config.get('input_controller', {}).get('type_interval', 0.01)
     
+    def refresh_screen_size(self):
+        """Query the screen size and cache it for pyautogui.
+        
+        pyautogui calls size() inside its own primitives; replacing it with
+        the cached tuple saves a display server round trip on each call.
+        Call this again when the display configuration changes, e.g. from a
+        wx.EVT_DISPLAY_CHANGED handler.
+        
+        Returns:
+            tuple: (width, height) of the screen
+        """
+        size = _query_screen_size()
+        self.screen_width, self.screen_height = size
+        pyautogui.size = lambda _cache=size: _cache
+        return size
+    
     def move_mouse(self, x, y, duration=None):
         """Move mouse cursor to specified coordinates
         
@@ -49,9 +149,18 @@ class InputController:
             x = max(0, min(x, self.screen_width))
             y = max(0, min(y, self.screen_height))
             
-            # Smooth movement to coordinates
-            pyautogui.moveTo(x, y, duration=duration)
-            logger.debug(f"Moved mouse to ({x}, {y})")
+            # Smooth movement to coordinates; the path is built in one go
+            # with NumPy and posted straight to the native backend
+            if duration > 0 and self._backend:
+                cur_x, cur_y = pyautogui.position()
+                steps = max(2, int(duration * _MOVE_RATE))
+                ts = np.linspace(0, duration, steps)
+                xs = np.rint(np.linspace(cur_x, x, steps))
+                ys = np.rint(np.linspace(cur_y, y, steps))
+                self._backend.schedule_move(xs, ys, ts)
+            else:
+                pyautogui.moveTo(x, y, duration=duration)
+            logger.debug("Moved mouse to ({}, {})", x, y)
             return True
         except Exception as e:
             logger.error(f"Error moving mouse: {e}")
@@ -71,6 +180,17 @@ class InputController:
             bool: Success status
         """
         try:
+            if duration is None:
+                duration = self.move_duration
+            
+            # An instant move+click goes out as one native event batch
+            if x is not None and y is not None and duration == 0 and self._backend:
+                x = max(0, min(x, self.screen_width))
+                y = max(0, min(y, self.screen_height))
+                self._backend.move_click(x, y, button, double)
+                logger.debug("Clicked {} button at ({}, {})", button, x, y)
+                return True
+            
             # If coordinates provided, move mouse there first
             if x is not None and y is not None:
                 self.move_mouse(x, y, duration)
@@ -79,10 +199,10 @@ class InputController:
             # Perform click action
             if double:
                 pyautogui.doubleClick(button=button)
-                logger.debug(f"Double-clicked {button} button")
+                logger.debug("Double-clicked {} button", button)
             else:
                 pyautogui.click(button=button)
-                logger.debug(f"Clicked {button} button")
+                logger.debug("Clicked {} button", button)
             return True
         except Exception as e:
             logger.error(f"Error clicking: {e}")
@@ -91,6 +211,11 @@ class InputController:
     def type_text(self, text, interval=None):
         """Type the specified text with a natural typing rhythm
         
+        Text longer than 50 characters typed with no interval is pasted from
+        the clipboard in one shortcut instead of one key event per character.
+        This replaces the clipboard contents. It is typed after all when the
+        clipboard cannot be used.
+        
         Args:
             text (str): Text to type
             interval (float, optional): Delay between keystrokes. Defaults to None.
@@ -102,9 +227,20 @@ class InputController:
             # Use default interval if not specified
             if interval is None:
                 interval = self.type_interval
+            
+            if interval == 0 and len(text) > _PASTE_THRESHOLD and pyperclip is not None:
+                try:
+                    pyperclip.copy(text)
+                except pyperclip.PyperclipException as e:
+                    # e.g. Linux without xclip or xsel
+                    logger.warning(f"Clipboard unavailable, typing text instead: {e}")
+                else:
+                    pyautogui.hotkey(_PASTE_MODIFIER, 'v')
+                    logger.debug("Pasted text: {}", text)
+                    return True
                 
             pyautogui.typewrite(text, interval=interval)
-            logger.debug(f"Typed text: {text}")
+            logger.debug("Typed text: {}", text)
             return True
         except Exception as e:
             logger.error(f"Error typing text: {e}")
@@ -121,7 +257,7 @@ class InputController:
         """
         try:
             pyautogui.press(key)
-            logger.debug(f"Pressed key: {key}")
+            logger.debug("Pressed key: {}", key)
             return True
         except Exception as e:
             logger.error(f"Error pressing key: {e}")
@@ -139,7 +275,7 @@ class InputController:
         try:
             # For Mac, 'command' is used instead of 'ctrl' for many shortcuts
             pyautogui.hotkey(*keys)
-            logger.debug(f"Pressed key combination: {keys}")
+            logger.debug("Pressed key combination: {}", keys)
             return True
         except Exception as e:
             logger.error(f"Error with key combination: {e}")
@@ -158,10 +294,10 @@ class InputController:
         try:
             if direction.lower() == "up":
                 pyautogui.scroll(clicks)  # Positive for up
-                logger.debug(f"Scrolled up {clicks} clicks")
+                logger.debug("Scrolled up {} clicks", clicks)
             else:
                 pyautogui.scroll(-clicks)  # Negative for down
-                logger.debug(f"Scrolled down {clicks} clicks")
+                logger.debug("Scrolled down {} clicks", clicks)
             return True
         except Exception as e:
             logger.error(f"Error scrolling: {e}")
@@ -1,12 +1,46 @@
+import os
+import re
+import hashlib
+import tempfile
+import threading
+import concurrent.futures
+
+# Tesseract's OpenMP threading scales poorly; one thread per engine with
+# several engines in parallel (extract_text_many) is faster. This has to be
+# set before the tesseract library is loaded.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
 import pytesseract
 import cv2
 import numpy as np
 from PIL import ImageGrab
 from loguru import logger
 
+try:
+    import mss  # direct BGRA screen grabs into a reusable buffer
+except ImportError:
+    mss = None
+
+try:
+    import tesserocr  # in-process Tesseract API, no subprocess per call
+except ImportError:
+    tesserocr = None
+
 class ScreenReader:
     """Analyzes screen content using OCR and computer vision"""
     
+    # Word-level OCR fields used from image_to_data output
+    _OCR_KEYS = ('text', 'conf', 'left', 'top', 'width', 'height')
+    
+    # UI element type by the class id computed in identify_ui_elements
+    _UI_ELEMENT_TYPES = ('unknown', 'input_field', 'button')
+    
+    # Narrowest image that ocr_scale is applied to (4K/Retina captures)
+    _OCR_SCALE_MIN_WIDTH = 2560
+    
+    # Tile OCR results kept before the cache is cleared
+    _TILE_CACHE_MAX = 4096
+    
     def __init__(self, config=None):
         """Initialize screen reader
         
@@ -29,8 +63,122 @@ class ScreenReader:
             self.ocr_config = config.get('screen_reader', {}).get('ocr_config', self.ocr_config)
             self.confidence_threshold = config.get('screen_reader', {}).get('confidence_threshold', 0.7)
         
+        # Downscale factor for OCR input at least _OCR_SCALE_MIN_WIDTH wide
+        self.ocr_scale = 0.5
+        if config:
+            self.ocr_scale = config.get('screen_reader', {}).get('ocr_scale', 0.5)
+        
+        # Tile-level OCR cache; disabled when the tile size is 0. Words that
+        # straddle a tile edge can be split, so it suits mostly static UI
+        self.ocr_tile_size = 0
+        if config:
+            self.ocr_tile_size = config.get('screen_reader', {}).get('ocr_tile_size', 0)
+        self._tile_cache = {}
+        self._tile_cache_shape = None
+        
+        # Run the OpenCV pipelines on the GPU through OpenCL when available
+        self.use_opencl = True
+        if config:
+            self.use_opencl = config.get('screen_reader', {}).get('use_opencl', True)
+        self.use_opencl = bool(self.use_opencl) and cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(self.use_opencl)
+        if self.use_opencl:
+            logger.info("Using OpenCL for image processing")
+        
+        # Thumbnail hash and OCR result of the last find_element_by_text frame
+        self._last_thumb_hash = None
+        self._last_text_elements = None
+        self._last_text_lower = None
+        
+        # Intermediate buffers for preprocess_image and identify_ui_elements
+        self._prep_gray = None
+        self._prep_blur = None
+        
+        # Screen grabber and the BGR frame buffer reused across captures
+        self._sct = None
+        self._frame_buf = None
+        if mss is not None:
+            try:
+                self._sct = mss.mss()
+            except Exception as e:
+                logger.error(f"mss unavailable, falling back to PIL capture: {e}")
+        
+        # Keep one Tesseract engine loaded when tesserocr is installed;
+        # pytesseract starts a tesseract process for every call otherwise
+        self._tess_api = None
+        self._tess_owner = threading.get_ident()
+        self._tess_local = threading.local()
+        if tesserocr is not None:
+            try:
+                self._tess_api = self._create_tess_api()
+                logger.info("Using in-process tesserocr OCR engine")
+            except Exception as e:
+                logger.error(f"tesserocr unavailable, falling back to pytesseract: {e}")
+        
+        # Worker pool for extract_text_many, created on first use. Its
+        # threads live as long as the reader so their tesserocr engines do too
+        self._ocr_executor = None
+        self._ocr_executor_lock = threading.Lock()
+        
         logger.info("Screen reader initialized")
     
+    def _create_tess_api(self):
+        """Create a tesserocr API using the page segmentation and engine
+        modes from ocr_config.
+        
+        Returns:
+            tesserocr.PyTessBaseAPI: Initialized OCR engine
+        """
+        psm = re.search(r'--psm\s+(\d+)', self.ocr_config)
+        oem = re.search(r'--oem\s+(\d+)', self.ocr_config)
+        return tesserocr.PyTessBaseAPI(
+            psm=int(psm.group(1)) if psm else tesserocr.PSM.AUTO,
+            oem=int(oem.group(1)) if oem else tesserocr.OEM.DEFAULT
+        )
+    
+    def _run_ocr(self, image):
+        """Run OCR on a single-channel image.
+        
+        Args:
+            image (numpy.ndarray): 8-bit grayscale or binary image
+            
+        Returns:
+            dict: Word-level lists keyed like pytesseract's image_to_data
+                (text, conf, left, top, width, height)
+        """
+        if self._tess_api is None:
+            return pytesseract.image_to_data(image, config=self.ocr_config, output_type=pytesseract.Output.DICT)
+        
+        # A tesserocr engine must not be shared between threads
+        api = self._tess_api
+        if threading.get_ident() != self._tess_owner:
+            api = getattr(self._tess_local, 'api', None)
+            if api is None:
+                api = self._tess_local.api = self._create_tess_api()
+        
+        height, width = image.shape[:2]
+        image = np.ascontiguousarray(image)
+        api.SetImageBytes(image.tobytes(), width, height, 1, width)
+        api.Recognize()
+        
+        ocr_data = {key: [] for key in self._OCR_KEYS}
+        iterator = api.GetIterator()
+        if iterator is None:
+            return ocr_data
+        level = tesserocr.RIL.WORD
+        for word in tesserocr.iterate_level(iterator, level):
+            box = word.BoundingBox(level)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            ocr_data['text'].append(word.GetUTF8Text(level) or '')
+            ocr_data['conf'].append(word.Confidence(level))
+            ocr_data['left'].append(x1)
+            ocr_data['top'].append(y1)
+            ocr_data['width'].append(x2 - x1)
+            ocr_data['height'].append(y2 - y1)
+        return ocr_data
+    
     def preprocess_image(self, image):
         """Preprocess image for better OCR accuracy
         
@@ -41,14 +189,21 @@ class ScreenReader:
             numpy.ndarray: Processed image
         """
         try:
+            # With OpenCL the per-pixel passes run on the GPU through UMat;
+            # otherwise grayscale and blur write into buffers reused across
+            # calls of the same size, so only the returned image is allocated
+            src, gray_buf, blur_buf = self._pipeline_input(image)
+            
             # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst=gray_buf)
             
             # Apply Gaussian blur to reduce noise
-            denoised = cv2.GaussianBlur(gray, (3, 3), 0)
+            denoised = cv2.GaussianBlur(gray, (3, 3), 0, dst=blur_buf)
             
-            # Apply adaptive thresholding
-            binary = cv2.adaptiveThreshold(
+            # Apply adaptive thresholding. A morphological close with a 1x1
+            # kernel used to follow; it leaves the image unchanged, so the
+            # full-image pass is skipped
+            processed = cv2.adaptiveThreshold(
                 denoised,
                 255,
                 cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
@@ -56,10 +211,8 @@ class ScreenReader:
                 11,
                 2
             )
-            
-            # Perform morphological operations to remove noise
-            kernel = np.ones((1, 1), np.uint8)
-            processed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+            if isinstance(processed, cv2.UMat):
+                processed = processed.get()
             
             logger.debug("Image preprocessing completed")
             return processed
@@ -76,7 +229,23 @@ class ScreenReader:
         Returns:
             numpy.ndarray: Captured image as numpy array
         """
+        image = self._capture_frame(region)
+        return image.copy() if image is not None else None
+    
+    def _capture_frame(self, region=None):
+        """Capture the screen into the reused frame buffer
+        
+        Args:
+            region (tuple, optional): Region to capture (left, top, width, height)
+            
+        Returns:
+            numpy.ndarray: BGR image backed by self._frame_buf, overwritten by
+                the next capture, or None if capture failed
+        """
         try:
+            if self._sct is not None:
+                return self._capture_mss(region)
+            
             # Capture screen using PIL
             if region:
                 left, top, width, height = region
@@ -84,10 +253,10 @@ class ScreenReader:
             else:
                 screenshot = ImageGrab.grab()
             
-            # Convert to numpy array for OpenCV processing
-            image = np.array(screenshot)
-            # Convert RGB to BGR (OpenCV format)
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            # View the screenshot as a numpy array and convert RGB to BGR
+            # (OpenCV format) into the frame buffer
+            rgb = np.asarray(screenshot)
+            image = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._frame_buffer(rgb.shape))
             
             logger.debug(f"Screen captured: {image.shape}")
             return image
@@ -95,6 +264,95 @@ class ScreenReader:
             logger.error(f"Error capturing screen: {e}")
             return None
     
+    def _thumbnail_hash(self, image):
+        """Hash a small grayscale thumbnail of a frame to spot unchanged screens
+        
+        Args:
+            image (numpy.ndarray): BGR image
+            
+        Returns:
+            bytes: Digest of the frame size and its 64x64 thumbnail
+        """
+        thumb = cv2.resize(image, (64, 64), interpolation=cv2.INTER_AREA)
+        thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        digest = hashlib.blake2b(thumb.tobytes(), digest_size=8)
+        digest.update(str(image.shape).encode())
+        return digest.digest()
+    
+    def _pipeline_input(self, image):
+        """Pick the source and output buffers for a grayscale/blur pipeline
+        
+        Args:
+            image (numpy.ndarray): BGR image
+            
+        Returns:
+            tuple: (source, gray buffer, blur buffer); the source is a
+                cv2.UMat and the buffers None when OpenCL is in use
+        """
+        if self.use_opencl:
+            return cv2.UMat(image), None, None
+        gray_buf, blur_buf = self._work_buffers(image.shape[:2])
+        return image, gray_buf, blur_buf
+    
+    def _work_buffers(self, shape):
+        """Return grayscale and blur buffers for an image of the given size
+        
+        The buffers are reused while the size stays the same. Their
+        contents only live for one preprocess_image or
+        identify_ui_elements call.
+        
+        Args:
+            shape (tuple): (height, width)
+            
+        Returns:
+            tuple: (gray buffer, blur buffer) as uint8 arrays
+        """
+        if self._prep_gray is None or self._prep_gray.shape != shape:
+            self._prep_gray = np.empty(shape, dtype=np.uint8)
+            self._prep_blur = np.empty(shape, dtype=np.uint8)
+        return self._prep_gray, self._prep_blur
+    
+    def _capture_mss(self, region=None):
+        """Grab the screen with mss straight into the reused BGR buffer
+        
+        mss returns BGRA, so one cvtColor into the persistent buffer replaces
+        PIL's grab, the np.array copy and the RGB to BGR conversion.
+        
+        Args:
+            region (tuple, optional): Region to capture (left, top, width, height)
+            
+        Returns:
+            numpy.ndarray: BGR image backed by self._frame_buf
+        """
+        if region:
+            left, top, width, height = region
+            monitor = {'left': left, 'top': top, 'width': width, 'height': height}
+        else:
+            monitor = self._sct.monitors[1]
+        
+        raw = self._sct.grab(monitor)
+        bgra = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+        
+        frame = self._frame_buffer((raw.height, raw.width))
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=frame)
+        
+        logger.debug("Screen captured: {}", frame.shape)
+        return frame
+    
+    def _frame_buffer(self, shape):
+        """Return the BGR capture buffer for a frame of the given size
+        
+        Args:
+            shape (tuple): (height, width, ...) of the captured frame
+            
+        Returns:
+            numpy.ndarray: uint8 buffer, reallocated only when the size changes
+        """
+        shape = (shape[0], shape[1], 3)
+        if self._frame_buf is None or self._frame_buf.shape != shape:
+            self._frame_buf = np.empty(shape, dtype=np.uint8)
+        return self._frame_buf
+    
     def extract_text(self, image):
         """Extract text from image using OCR
         
@@ -105,40 +363,220 @@ class ScreenReader:
             dict: Dictionary with text content and positions
         """
         try:
-            # Convert to grayscale for better OCR
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Apply threshold to get black and white image
-            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
             # Get OCR data including bounding boxes
-            ocr_data = pytesseract.image_to_data(thresh, config=self.ocr_config, output_type=pytesseract.Output.DICT)
-            
-            # Process results
-            results = []
-            n_boxes = len(ocr_data['text'])
-            for i in range(n_boxes):
-                # Filter empty results and low confidence
-                if int(ocr_data['conf'][i]) > self.confidence_threshold * 100 and ocr_data['text'][i].strip() != '':
-                    text = ocr_data['text'][i]
-                    x = ocr_data['left'][i]
-                    y = ocr_data['top'][i]
-                    w = ocr_data['width'][i]
-                    h = ocr_data['height'][i]
-                    
-                    results.append({
-                        'text': text,
-                        'position': (x, y, w, h),
-                        'center': (x + w//2, y + h//2),
-                        'confidence': int(ocr_data['conf'][i]) / 100
-                    })
+            thresh, inv_scale = self._downscale_for_ocr(self._binarize(image))
+            if self.ocr_tile_size > 0:
+                ocr_data = self._run_ocr_tiled(thresh)
+            else:
+                ocr_data = self._run_ocr(thresh)
             
+            results = self._ocr_results(ocr_data, inv_scale)
             logger.debug(f"Extracted {len(results)} text elements")
             return results
         except Exception as e:
             logger.error(f"Error extracting text: {e}")
             return []
     
+    def _run_ocr_tiled(self, image):
+        """Run OCR tile by tile, reusing results for tiles seen before
+        
+        Tiles are keyed by a hash of their pixels, so only tiles whose
+        content changed since an earlier frame are sent to tesseract.
+        
+        Args:
+            image (numpy.ndarray): Binarized image
+            
+        Returns:
+            dict: Word-level OCR data in full-image coordinates
+        """
+        if image.shape != self._tile_cache_shape or len(self._tile_cache) > self._TILE_CACHE_MAX:
+            self._tile_cache.clear()
+            self._tile_cache_shape = image.shape
+        
+        size = self.ocr_tile_size
+        height, width = image.shape[:2]
+        ocr_data = {key: [] for key in self._OCR_KEYS}
+        for top in range(0, height, size):
+            for left in range(0, width, size):
+                tile = np.ascontiguousarray(image[top:top + size, left:left + size])
+                key = hashlib.blake2b(tile.data, digest_size=16).digest() + bytes(str(tile.shape), 'ascii')
+                tile_data = self._tile_cache.get(key)
+                if tile_data is None:
+                    tile_data = self._run_ocr(tile)
+                    self._tile_cache[key] = tile_data
+                
+                ocr_data['text'].extend(tile_data['text'])
+                ocr_data['conf'].extend(tile_data['conf'])
+                ocr_data['width'].extend(tile_data['width'])
+                ocr_data['height'].extend(tile_data['height'])
+                ocr_data['left'].extend(x + left for x in tile_data['left'])
+                ocr_data['top'].extend(y + top for y in tile_data['top'])
+        return ocr_data
+    
+    def extract_text_many(self, images):
+        """Extract text from several images in parallel
+        
+        Each worker runs its own single-threaded tesseract (a subprocess, or
+        a per-thread tesserocr engine); both release the GIL while OCR runs.
+        The worker pool is kept between calls, so tesserocr engines are only
+        loaded once per worker.
+        
+        Args:
+            images (list): Images (numpy.ndarray) to process
+            
+        Returns:
+            list: One list of text elements per image, as from extract_text
+        """
+        if len(images) <= 1:
+            return [self.extract_text(image) for image in images]
+        return list(self._get_ocr_executor().map(self.extract_text, images))
+    
+    def _get_ocr_executor(self):
+        """Return the OCR worker pool, creating it on first use
+        
+        Returns:
+            concurrent.futures.ThreadPoolExecutor: One worker per CPU
+        """
+        with self._ocr_executor_lock:
+            if self._ocr_executor is None:
+                self._ocr_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=os.cpu_count(), thread_name_prefix='ocr')
+            return self._ocr_executor
+    
+    def extract_text_batched(self, images, batch_size=50):
+        """Extract text from several images with one OCR engine start per batch
+        
+        Without tesserocr, each batch is written to a temporary directory and
+        passed to a single tesseract run through a list file, so the engine
+        and its models load once per batch instead of once per image.
+        Batches are capped to keep tesseract's output pipe from stalling.
+        
+        Args:
+            images (list): Images (numpy.ndarray) to process
+            batch_size (int, optional): Images per tesseract run. Defaults to 50.
+            
+        Returns:
+            list: One list of text elements per image, as from extract_text
+        """
+        results = []
+        for start in range(0, len(images), batch_size):
+            batch = images[start:start + batch_size]
+            try:
+                results.extend(self._extract_batch(batch))
+            except Exception as e:
+                logger.error(f"Error extracting text from batch: {e}")
+                results.extend([] for _ in batch)
+        return results
+    
+    def _extract_batch(self, images):
+        """Run OCR over one batch of images
+        
+        Args:
+            images (list): Images (numpy.ndarray) to process
+            
+        Returns:
+            list: One list of text elements per image
+        """
+        prepared = [self._downscale_for_ocr(self._binarize(image)) for image in images]
+        binarized = [image for image, _ in prepared]
+        scales = [inv_scale for _, inv_scale in prepared]
+        if self._tess_api is not None:
+            return [self._ocr_results(self._run_ocr(image), inv_scale) for image, inv_scale in prepared]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = []
+            for i, image in enumerate(binarized):
+                path = os.path.join(tmp_dir, f"{i}.png")
+                cv2.imwrite(path, image)
+                paths.append(path)
+            list_path = os.path.join(tmp_dir, "images.txt")
+            with open(list_path, "w") as f:
+                f.write("\n".join(paths) + "\n")
+            ocr_data = pytesseract.image_to_data(list_path, config=self.ocr_config, output_type=pytesseract.Output.DICT)
+        
+        # Split rows back into per-image results by tesseract's page number
+        pages = [{key: [] for key in self._OCR_KEYS} for _ in images]
+        for i, page_num in enumerate(ocr_data['page_num']):
+            page = pages[int(page_num) - 1]
+            for key in self._OCR_KEYS:
+                page[key].append(ocr_data[key][i])
+        return [self._ocr_results(page, inv_scale) for page, inv_scale in zip(pages, scales)]
+    
+    def _binarize(self, image):
+        """Convert an image to the black and white form used for OCR
+        
+        Args:
+            image (numpy.ndarray): BGR image
+            
+        Returns:
+            numpy.ndarray: Otsu-thresholded grayscale image
+        """
+        # Convert to grayscale for better OCR
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        
+        # Apply threshold to get black and white image
+        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return thresh
+    
+    def _downscale_for_ocr(self, image):
+        """Shrink a high-resolution image before OCR
+        
+        Tesseract's cost grows with pixel count, and UI text on a 4K or
+        Retina capture stays legible at half size. Narrower images are left
+        alone so small fonts aren't lost.
+        
+        Args:
+            image (numpy.ndarray): Binarized image
+            
+        Returns:
+            tuple: (image to OCR, factor mapping its coordinates back)
+        """
+        if self.ocr_scale >= 1.0 or image.shape[1] < self._OCR_SCALE_MIN_WIDTH:
+            return image, 1.0
+        small = cv2.resize(image, None, fx=self.ocr_scale, fy=self.ocr_scale, interpolation=cv2.INTER_AREA)
+        return small, 1.0 / self.ocr_scale
+    
+    def _ocr_results(self, ocr_data, inv_scale=1.0):
+        """Turn word-level OCR data into text elements
+        
+        Args:
+            ocr_data (dict): Lists keyed like pytesseract's image_to_data
+            inv_scale (float, optional): Factor mapping OCR coordinates back
+                to the original image. Defaults to 1.0.
+            
+        Returns:
+            list: Text elements above the confidence threshold
+        """
+        texts = ocr_data['text']
+        if not texts:
+            return []
+        
+        # Filter low confidence with an array mask, then drop empty text
+        # among the survivors; tesseract's block and line rows (conf -1)
+        # never reach the string check
+        conf = np.asarray(ocr_data['conf'], dtype=np.float64).astype(np.int64)
+        idx = np.flatnonzero(conf > self.confidence_threshold * 100)
+        if idx.size:
+            idx = idx[np.fromiter((bool(texts[i].strip()) for i in idx.tolist()), dtype=bool, count=idx.size)]
+        if idx.size == 0:
+            return []
+        
+        boxes = np.stack([np.asarray(ocr_data[key])[idx] for key in ('left', 'top', 'width', 'height')], axis=1)
+        if inv_scale != 1.0:
+            boxes = np.rint(boxes * inv_scale)
+        boxes = boxes.astype(np.int64)
+        centers = boxes[:, :2] + boxes[:, 2:] // 2
+        
+        return [
+            {
+                'text': texts[i],
+                'position': tuple(box),
+                'center': tuple(center),
+                'confidence': c / 100
+            }
+            for i, box, center, c in zip(idx.tolist(), boxes.tolist(), centers.tolist(), conf[idx].tolist())
+        ]
+    
     def identify_ui_elements(self, image):
         """Detect UI elements like buttons, input fields, etc.
         
@@ -154,40 +592,51 @@ class ScreenReader:
         
         try:
             # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            src, gray_buf, blur_buf = self._pipeline_input(image)
+            gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst=gray_buf)
             
             # Apply Gaussian blur to reduce noise
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+            blurred = cv2.GaussianBlur(gray, (5, 5), 0, dst=blur_buf)
             
             # Apply Canny edge detection
             edges = cv2.Canny(blurred, 50, 150)
+            if isinstance(edges, cv2.UMat):
+                edges = edges.get()
             
             # Find contours
             contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
-            # Process contours to identify UI elements
-            ui_elements = []
-            for contour in contours:
-                # Get bounding rectangle
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Filter out very small rectangles
-                if w > 20 and h > 10:
-                    # Determine element type based on shape
-                    aspect_ratio = w / float(h)
-                    
-                    if 2.5 <= aspect_ratio <= 6.0 and h < 40:
-                        element_type = 'input_field'
-                    elif 1.0 <= aspect_ratio <= 3.0 and h < 50:
-                        element_type = 'button'
-                    else:
-                        element_type = 'unknown'
-                    
-                    ui_elements.append({
-                        'type': element_type,
-                        'position': (x, y, w, h),
-                        'center': (x + w//2, y + h//2)
-                    })
+            if not contours:
+                logger.debug("Identified 0 UI elements")
+                return []
+            
+            # Bounding rectangles as an (N, 4) array of x, y, w, h
+            rects = np.array([cv2.boundingRect(contour) for contour in contours], dtype=np.int32)
+            
+            # Filter out very small rectangles
+            rects = rects[(rects[:, 2] > 20) & (rects[:, 3] > 10)]
+            x, y, w, h = rects.T
+            
+            # Determine element type based on shape
+            aspect_ratio = w / h.astype(np.float64)
+            type_ids = np.where(
+                (aspect_ratio >= 2.5) & (aspect_ratio <= 6.0) & (h < 40), 1,
+                np.where((aspect_ratio >= 1.0) & (aspect_ratio <= 3.0) & (h < 50), 2, 0)
+            )
+            centers_x = x + w // 2
+            centers_y = y + h // 2
+            
+            ui_elements = [
+                {
+                    'type': self._UI_ELEMENT_TYPES[type_id],
+                    'position': (ex, ey, ew, eh),
+                    'center': (cx, cy)
+                }
+                for type_id, ex, ey, ew, eh, cx, cy in zip(
+                    type_ids.tolist(), x.tolist(), y.tolist(), w.tolist(), h.tolist(),
+                    centers_x.tolist(), centers_y.tolist()
+                )
+            ]
             
             logger.debug(f"Identified {len(ui_elements)} UI elements")
             return ui_elements
@@ -195,6 +644,33 @@ class ScreenReader:
             logger.error(f"Error identifying UI elements: {e}")
             return []
     
+    def _screen_text_elements(self):
+        """Capture the screen and return its OCR elements with lowered text
+        
+        The OCR result and the lowered element texts are reused while the
+        screen thumbnail stays the same.
+        
+        Returns:
+            tuple: (text_elements, lowered_texts), or (None, None) if capture failed
+        """
+        # Capture screen; the frame is only needed until OCR has run
+        image = self._capture_frame()
+        if image is None:
+            return None, None
+        
+        # Extract text from screen, unless it looks the same as the
+        # last time and the previous OCR result still applies
+        thumb_hash = self._thumbnail_hash(image)
+        if thumb_hash == self._last_thumb_hash and self._last_text_elements is not None:
+            logger.debug("Screen unchanged, reusing previous OCR result")
+        else:
+            text_elements = self.extract_text(image)
+            self._last_thumb_hash = thumb_hash
+            self._last_text_elements = text_elements
+            self._last_text_lower = [element['text'].lower() for element in text_elements]
+        
+        return self._last_text_elements, self._last_text_lower
+    
     def find_element_by_text(self, text, case_sensitive=False):
         """Find UI element containing specific text
         
@@ -206,28 +682,81 @@ class ScreenReader:
             dict: Element position and properties, or None if not found
         """
         try:
-            # Capture screen
-            image = self.capture_screen()
-            if image is None:
+            text_elements, lowered_texts = self._screen_text_elements()
+            if text_elements is None:
                 return None
             
-            # Extract text from screen
-            text_elements = self.extract_text(image)
+            # Search for matching text, lowering the target only once
+            if case_sensitive:
+                haystacks = [element['text'] for element in text_elements]
+                needle = text
+            else:
+                haystacks = lowered_texts
+                needle = text.lower()
             
-            # Search for matching text
-            for element in text_elements:
-                element_text = element['text']
-                if not case_sensitive:
-                    if text.lower() in element_text.lower():
-                        logger.info(f"Found text '{text}' at {element['center']}")
-                        return element
-                else:
-                    if text in element_text:
-                        logger.info(f"Found text '{text}' at {element['center']}")
-                        return element
+            for element, element_text in zip(text_elements, haystacks):
+                if element_text.find(needle) != -1:
+                    logger.info(f"Found text '{text}' at {element['center']}")
+                    return element
             
             logger.warning(f"Text '{text}' not found on screen")
             return None
         except Exception as e:
             logger.error(f"Error finding element by text: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def find_elements_by_texts(self, targets, case_sensitive=False):
+        """Find UI elements for several texts with one OCR pass over the screen
+        
+        Args:
+            targets (list): Texts to find
+            case_sensitive (bool, optional): Whether search is case sensitive. Defaults to False.
+            
+        Returns:
+            dict: Maps each target to the first element containing it, or None if not found
+        """
+        results = {target: None for target in targets}
+        try:
+            if not targets:
+                return results
+            
+            text_elements, lowered_texts = self._screen_text_elements()
+            if text_elements is None:
+                return results
+            
+            if case_sensitive:
+                haystacks = [element['text'] for element in text_elements]
+                needles = {target: [target] for target in targets}
+            else:
+                haystacks = lowered_texts
+                needles = {}
+                for target in targets:
+                    needles.setdefault(target.lower(), []).append(target)
+            
+            # Check the still-missing targets against each element; found
+            # targets drop out so later elements are checked for fewer
+            for element, element_text in zip(text_elements, haystacks):
+                for needle in [n for n in needles if n in element_text]:
+                    for target in needles.pop(needle):
+                        results[target] = element
+                if not needles:
+                    return results
+            
+            logger.warning(f"Texts not found on screen: {[t for group in needles.values() for t in group]}")
+            return results
+        except Exception as e:
+            logger.error(f"Error finding elements by texts: {e}")
+            return results
+    
+    def cleanup(self):
+        """Release the OCR worker pool and the screen grabber"""
+        with self._ocr_executor_lock:
+            executor, self._ocr_executor = self._ocr_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception as e:
+                logger.error(f"Error closing screen grabber: {e}")
+            self._sct = None
\ No newline at end of file
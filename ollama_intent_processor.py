@@ -1,15 +1,66 @@
 import os
+import re
 import json
+import collections
 import requests
+from requests.adapters import HTTPAdapter
 import threading
 import time
 from loguru import logger
 from utils.logger import setup_logger
 
+try:
+    import orjson  # faster (de)serialization for Ollama traffic
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+
 # Initialize logger
 logger = setup_logger()
 
+# Commands that are unambiguous as the whole utterance. Everything else,
+# including "close ...", "start ..." and questions, is left to the LLM
+_FAST_INTENT_RE = re.compile(r"""
+    ^\s*(?:
+        (?P<exit>exit|quit|bye|goodbye)
+      | (?P<help>help|what\s+can\s+you\s+do\??)
+      | scroll\s+(?P<direction>up|down)(?:\s+(?P<amount>[0-9]{1,4}))?
+      | open\s+(?P<open>[^?]+?)
+      | click\s+(?:on\s+)?(?P<click>[^?]+?)
+      | type\s+(?!of\b)(?P<type>[^?]+?)
+    )[\s.!]*$
+""", re.IGNORECASE | re.VERBOSE)
+
 class OllamaIntentProcessor:
+    # System prompt for generate_response
+    _RESPONSE_PROMPT = """You are Buddy, a helpful, friendly computer control assistant with a distinct personality. 
+        Generate a natural, conversational response to the user based on the intent and parameters that were recognized.
+        
+        Be personable, engaging, and show some personality in your responses. Use varied language and phrasing.
+        Avoid robotic or template-like responses. Each response should feel unique and tailored to the situation.
+        
+        For example:
+        - Instead of "I'll click for you now" try "I'll click on that button for you right away!"
+        - Instead of "I'll open for you now" try "Opening that for you now. Just a moment!"
+        - For unknown intents, be helpful and suggest what the user might want to do
+        
+        Keep responses concise but friendly.
+        """
+    
+    # Longest wait between reconnect attempts (seconds)
+    _MAX_BACKOFF = 60.0
+    
+    # Command intents remembered by process_text
+    _INTENT_CACHE_SIZE = 256
+    
+    # Intents whose single parameter is returned as a plain value, as the
+    # pattern fast path does
+    _SINGLE_ARG_INTENTS = ('click', 'type', 'open')
+    
     def __init__(self, config=None):
         """Initialize the Ollama-based intent processor
         
@@ -20,6 +71,15 @@ class OllamaIntentProcessor:
         self.model = "llama3" if config is None else config.get('llm', {}).get('model', "llama3")
         self.endpoint = "http://localhost:11434/api/generate"
         
+        # One keep-alive session for all calls to the local Ollama server
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=2, max_retries=0))
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Content-Type': 'application/json'
+        })
+        
         # Define supported intents and their parameters
         self.supported_intents = {
             'click': ['target'],
@@ -30,41 +90,75 @@ class OllamaIntentProcessor:
             'exit': []
         }
         
-        # Connection status
+        # Intent prompt, built once; process_text only appends the user text
+        self._supported_intents_csv = ', '.join(self.supported_intents.keys())
+        self._system_prompt = f"""You are Buddy, an AI assistant that helps control the computer and answer questions.
+        For computer control commands, extract the intent and parameters from user input.
+        For general questions, provide direct, concise answers.
+        
+        When controlling the computer, use these intents:
+        {self._supported_intents_csv}
+        
+        For questions and conversation:
+        - Provide direct, concise answers
+        - Keep responses under 50 words
+        - Be friendly but efficient
+        
+        Response format:
+        For commands: {{
+            "intent": "<intent_name>",
+            "parameters": {{}},
+            "response": "<confirmation_message>"  // New field for verbal response
+        }}
+        
+        For questions: {{
+            "intent": "conversation",
+            "response": "<your_answer>"  // Direct answer to the question
+        }}
+        """
+        
+        # Command intents by (model, normalized text), least recent first
+        self._intent_cache = collections.OrderedDict()
+        self._intent_cache_lock = threading.Lock()
+        
+        # Connection status. Reconnects happen on demand, spaced by an
+        # exponential backoff, rather than from a polling thread
         self.server_available = False
-        self.connection_check_interval = 10  # seconds
+        self._next_retry_at = 0.0
+        self._backoff = 1.0  # seconds
         
         # Check if Ollama is available and select the best model
-        self._check_ollama_availability()
-        
-        # Start background thread to periodically check connection
-        self.should_continue_checking = True
-        self.connection_thread = threading.Thread(target=self._connection_monitor)
-        self.connection_thread.daemon = True
-        self.connection_thread.start()
-        logger.info("Started Ollama connection monitoring thread")
+        self._reconnect_if_due()
     
-    def _connection_monitor(self):
-        """Background thread to monitor Ollama server connection"""
-        while self.should_continue_checking:
-            if not self.server_available:
-                logger.info("Attempting to connect to Ollama server...")
-                self._check_ollama_availability()
-            time.sleep(self.connection_check_interval)
+    def _reconnect_if_due(self):
+        """Re-check the Ollama server if it is down and a retry is due
+        
+        Returns:
+            bool: Whether the server is available
+        """
+        if self.server_available:
+            return True
+        
+        now = time.monotonic()
+        if now < self._next_retry_at:
+            return False
+        
+        logger.info("Attempting to connect to Ollama server...")
+        self._check_ollama_availability()
+        if self.server_available:
+            self._backoff = 1.0
+            self._next_retry_at = 0.0
+        else:
+            self._next_retry_at = now + self._backoff
+            self._backoff = min(self._backoff * 2, self._MAX_BACKOFF)
+        return self.server_available
     
     def _check_ollama_availability(self):
-        def check_server(self):
-            """Check if Ollama server is available"""
-            try:
-                response = requests.get("http://localhost:11434/api/tags", timeout=5)
-                return response.status_code == 200
-            except Exception:
-                return False
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
+            response = self.session.get("http://localhost:11434/api/tags", timeout=5)
             if response.status_code == 200:
                 self.server_available = True
-                available_models = response.json().get("models", [])
+                available_models = _json_loads(response.content).get("models", [])
                 if not available_models:
                     logger.warning("No models found in Ollama")
                     return
@@ -116,48 +210,87 @@ class OllamaIntentProcessor:
             logger.warning("Ollama may not be running. Will retry connection later.")
     
     def process_text(self, text):
-        """Process text through Ollama to determine intent"""
-        logger.debug(f"Processing text with Ollama: {text}")
+        """Process text through Ollama to determine intent
         
-        if not self.server_available:
-            logger.info("Ollama server not available, attempting to reconnect...")
-            self._check_ollama_availability()
+        An utterance that is nothing but a plain command (e.g. "scroll
+        down", "open youtube.com") is resolved locally without a request.
+        Command intents are cached per model and whitespace-normalized text,
+        so a repeated command skips the LLM round trip. Conversation replies
+        and failures are not cached.
+        
+        Args:
+            text (str): Text to process
             
-            if not self.server_available:
-                logger.warning("Cannot process text: Ollama server is not available")
-                return ('unknown', None)
+        Returns:
+            tuple: (intent, parameters)
+        """
+        logger.debug(f"Processing text with Ollama: {text}")
         
-        # Create a more conversational prompt
-        system_prompt = f"""You are Buddy, an AI assistant that helps control the computer and answer questions.
-        For computer control commands, extract the intent and parameters from user input.
-        For general questions, provide direct, concise answers.
+        result = self._match_fast_intent(text)
+        if result:
+            logger.debug(f"Matched intent without Ollama: {result[0]}")
+            return result
         
-        When controlling the computer, use these intents:
-        {', '.join(self.supported_intents.keys())}
+        if not self._reconnect_if_due():
+            logger.warning("Cannot process text: Ollama server is not available")
+            return ('unknown', None)
         
-        For questions and conversation:
-        - Provide direct, concise answers
-        - Keep responses under 50 words
-        - Be friendly but efficient
+        key = (self.model, " ".join(text.split()))
+        with self._intent_cache_lock:
+            cached = self._intent_cache.get(key)
+            if cached is not None:
+                self._intent_cache.move_to_end(key)
+        if cached is None:
+            cached = self._request_intent(key[1])
+            if cached[0] not in ('unknown', 'conversation'):
+                with self._intent_cache_lock:
+                    self._intent_cache[key] = cached
+                    if len(self._intent_cache) > self._INTENT_CACHE_SIZE:
+                        self._intent_cache.popitem(last=False)
+        else:
+            logger.debug(f"Intent cache hit: {key[1]}")
         
-        Response format:
-        For commands: {{
-            "intent": "<intent_name>",
-            "parameters": {{}},
-            "response": "<confirmation_message>"  // New field for verbal response
-        }}
+        # Hand out a copy so callers can't mutate the cached entry
+        intent, params = cached
+        if isinstance(params, dict):
+            params = dict(params)
+        return (intent, params)
+    
+    def _match_fast_intent(self, text):
+        """Match text that is a plain command from start to end
         
-        For questions: {{
-            "intent": "conversation",
-            "response": "<your_answer>"  // Direct answer to the question
-        }}
+        Args:
+            text (str): Text to process
+            
+        Returns:
+            tuple: (intent, parameters), or None if the text is not a plain command
         """
+        match = _FAST_INTENT_RE.match(text)
+        if not match:
+            return None
+        if match.group('direction'):
+            amount = int(match.group('amount')) if match.group('amount') else 5  # Default
+            return ('scroll', {'direction': match.group('direction').lower(), 'amount': amount})
+        for intent in ('exit', 'help'):
+            if match.group(intent):
+                return (intent, None)
+        intent = match.lastgroup
+        return (intent, match.group(intent))
+    
+    def _request_intent(self, text):
+        """Ask Ollama for the intent of text, bypassing the cache
         
+        Args:
+            text (str): Normalized text to process
+            
+        Returns:
+            tuple: (intent, parameters)
+        """
         # Prepare the API payload
         payload = {
             "model": self.model,
-            "prompt": f"{system_prompt}\n\nUser: {text}\n\nAssistant:",
-            "stream": False,
+            "prompt": self._system_prompt + "\n\nUser: " + text + "\n\nAssistant:",
+            "stream": True,
             "format": "json",
             "temperature": 0.7,
             "context_window": 4096,
@@ -166,19 +299,21 @@ class OllamaIntentProcessor:
         
         try:
             logger.debug(f"Sending request to Ollama with payload: {payload}")
-            response = requests.post(self.endpoint, json=payload, timeout=30)  # Increased timeout
+            response = self.session.post(self.endpoint, data=_json_dumps(payload), stream=True, timeout=30)  # Increased timeout
             logger.debug(f"Ollama response status: {response.status_code}")
-            logger.debug(f"Ollama raw response: {response.text}")
             
             if response.status_code != 200:
                 logger.error(f"Ollama server error: {response.status_code}")
+                response.close()
                 return ('unknown', None)
-                
-            result = response.json()
-            content = result.get('response', '{}')
+            
+            # The reply is a single JSON object, so stop reading as soon as
+            # it is complete rather than waiting for generation to finish
+            content = self._read_stream(response, stop_at_json=True) or '{}'
+            logger.debug(f"Ollama raw response: {content}")
             
             try:
-                parsed = json.loads(content)
+                parsed = _json_loads(content)
                 intent = parsed.get('intent', 'unknown')
                 parameters = parsed.get('parameters', {})
                 response_text = parsed.get('response', '')
@@ -193,12 +328,20 @@ class OllamaIntentProcessor:
                 if intent == 'conversation':
                     return ('conversation', {'response': response_text})
                 
+                # {'target': 'submit button'} -> 'submit button'
+                if intent in self._SINGLE_ARG_INTENTS and isinstance(parameters, dict) and len(parameters) == 1:
+                    parameters = next(iter(parameters.values()))
+                
                 return (intent, parameters)
                 
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse Ollama response: {e}")
                 return ('unknown', None)
                 
+        except requests.exceptions.ConnectionError:
+            self.server_available = False
+            logger.error("Connection to Ollama server failed during intent processing")
+            return ('unknown', None)
         except requests.exceptions.Timeout:
             logger.error("Ollama request timed out")
             return ('unknown', None)
@@ -216,31 +359,12 @@ class OllamaIntentProcessor:
         
         # Continue with existing response generation logic
         # If server is not available, try to reconnect first
-        if not self.server_available:
-            logger.info("Ollama server not available, attempting to reconnect...")
-            self._check_ollama_availability()
-            
-            # If still not available, return fallback response
-            if not self.server_available:
-                logger.warning("Cannot generate response: Ollama server is not available")
-                if intent == 'unknown':
-                    return "I'm not sure what you want me to do. Also, I'm having trouble connecting to my language model. Please check if Ollama is running."
-                return f"I'll {intent} for you now. Note that I'm having trouble connecting to my language model for more detailed responses."
-        
-        # Create a prompt for Ollama with more personality
-        system_prompt = """You are Buddy, a helpful, friendly computer control assistant with a distinct personality. 
-        Generate a natural, conversational response to the user based on the intent and parameters that were recognized.
-        
-        Be personable, engaging, and show some personality in your responses. Use varied language and phrasing.
-        Avoid robotic or template-like responses. Each response should feel unique and tailored to the situation.
-        
-        For example:
-        - Instead of "I'll click for you now" try "I'll click on that button for you right away!"
-        - Instead of "I'll open for you now" try "Opening that for you now. Just a moment!"
-        - For unknown intents, be helpful and suggest what the user might want to do
-        
-        Keep responses concise but friendly.
-        """
+        # If still not available, return fallback response
+        if not self._reconnect_if_due():
+            logger.warning("Cannot generate response: Ollama server is not available")
+            if intent == 'unknown':
+                return "I'm not sure what you want me to do. Also, I'm having trouble connecting to my language model. Please check if Ollama is running."
+            return f"I'll {intent} for you now. Note that I'm having trouble connecting to my language model for more detailed responses."
         
         # Format the parameters for the prompt
         if isinstance(parameters, dict):
@@ -256,18 +380,17 @@ class OllamaIntentProcessor:
             # Call the Ollama API
             payload = {
                 "model": self.model,
-                "prompt": f"{system_prompt}\n\n{user_prompt}\n\nResponse:",
-                "stream": False,
+                "prompt": self._RESPONSE_PROMPT + "\n\n" + user_prompt + "\n\nResponse:",
+                "stream": True,
                 "max_tokens": 150  # Allow for slightly longer responses
             }
             
-            response = requests.post(self.endpoint, json=payload, timeout=10)
+            response = self.session.post(self.endpoint, data=_json_dumps(payload), stream=True, timeout=10)
             response.raise_for_status()
             self.server_available = True  # Update connection status on successful request
             
-            # Parse the response
-            result = response.json()
-            content = result.get('response', '')
+            # Assemble the streamed response
+            content = self._read_stream(response)
             
             return content.strip()
             
@@ -288,9 +411,43 @@ class OllamaIntentProcessor:
                 return "I'm not sure what you want me to do. Could you try phrasing that differently?"
             return f"I'll {intent} for you now."
     
+    def _read_stream(self, response, stop_at_json=False):
+        """Assemble the text of a streamed Ollama generate response
+        
+        Args:
+            response (requests.Response): Response opened with stream=True
+            stop_at_json (bool, optional): Stop once the text so far parses
+                as a JSON object with an intent. Defaults to False.
+            
+        Returns:
+            str: Generated text
+        """
+        chunks = []
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                if 'error' in chunk:
+                    raise RuntimeError(chunk['error'])
+                token = chunk.get('response', '')
+                chunks.append(token)
+                if chunk.get('done'):
+                    break
+                if stop_at_json and '}' in token:
+                    try:
+                        parsed = _json_loads(''.join(chunks))
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(parsed, dict) and 'intent' in parsed:
+                        logger.debug("Complete intent received, closing stream early")
+                        break
+        finally:
+            # Closing mid-stream drops the connection, which stops generation
+            response.close()
+        return ''.join(chunks)
+    
     def shutdown(self):
         """Clean shutdown of the intent processor"""
-        self.should_continue_checking = False
-        if hasattr(self, 'connection_thread') and self.connection_thread.is_alive():
-            self.connection_thread.join(timeout=1.0)
-            logger.info("Ollama connection monitoring thread stopped")
\ No newline at end of file
+        self.session.close()
+        logger.info("Ollama intent processor shut down")
\ No newline at end of file
@@ -1,15 +1,351 @@
 import speech_recognition as sr
+import os
 import time
+import asyncio
 import threading
 import queue
 import subprocess
+import signal
+import contextlib
+import collections
+import hashlib
+import textwrap
+import multiprocessing
+from multiprocessing import shared_memory
+from pathlib import Path
+from types import SimpleNamespace
+import numpy as np
 from loguru import logger
 
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None
+
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None
+
+try:
+    import sounddevice as sd
+except ImportError:
+    sd = None
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+try:
+    from AVFoundation import AVSpeechSynthesizer, AVSpeechUtterance, AVSpeechSynthesisVoice, AVAudioFile
+    from Foundation import NSURL
+except ImportError:
+    AVSpeechSynthesizer = None
+
+try:
+    import pty
+    import termios
+except ImportError:
+    pty = None
+
+# Markers on the ASR queue: None closes a phrase, _PHRASE_DISCARD drops it
+# unheard and _STREAM_STOP ends the stream
+_PHRASE_DISCARD = object()
+_STREAM_STOP = object()
+
+class _AudioRing:
+    """Ring buffer of int16 samples filled from the sounddevice callback
+    
+    The audio callback is the only writer and the capture thread the only
+    reader, so positions are tracked as running sample counts without a lock.
+    """
+    
+    def __init__(self, samples):
+        self.buffer = np.zeros(samples, dtype=np.int16)
+        self.written = 0
+        self.read_pos = 0
+        self.data_ready = threading.Event()
+    
+    def callback(self, indata, frames, time_info, status):
+        """sounddevice RawInputStream callback, copies the block into the ring"""
+        samples = np.frombuffer(indata, dtype=np.int16)
+        size = len(self.buffer)
+        start = self.written % size
+        first = min(frames, size - start)
+        self.buffer[start:start + first] = samples[:first]
+        self.buffer[:frames - first] = samples[first:]
+        self.written += frames
+        self.data_ready.set()
+    
+    def read(self, frames, timeout):
+        """Return the next block of samples, waiting for the callback if needed
+        
+        Args:
+            frames (int): Number of samples to read
+            timeout (float): Seconds to wait for new audio
+            
+        Returns:
+            bytes: int16 audio, or None if nothing arrived within the timeout
+        """
+        while self.written - self.read_pos < frames:
+            self.data_ready.clear()
+            if self.written - self.read_pos >= frames:
+                break
+            if not self.data_ready.wait(timeout):
+                return None
+        
+        size = len(self.buffer)
+        if self.written - self.read_pos > size:
+            # Reader fell a whole ring behind, skip to the newest audio
+            logger.warning("Audio ring buffer overrun, dropping old audio")
+            self.read_pos = self.written - frames
+        
+        start = self.read_pos % size
+        self.read_pos += frames
+        if start + frames <= size:
+            return self.buffer[start:start + frames].tobytes()
+        return np.concatenate((self.buffer[start:], self.buffer[:start + frames - size])).tobytes()
+
+def _transcribe_batch(pipeline, pcms, sample_rate, options):
+    """Transcribe several utterances with one batched Whisper call
+    
+    The utterances are laid end to end and each one is passed as its own clip,
+    so the pipeline encodes them as one batch. Segments are routed back to
+    their utterance by start time.
+    
+    Args:
+        pipeline (BatchedInferencePipeline): Batched faster-whisper pipeline
+        pcms (list): float32 arrays, each shorter than 30 seconds
+        sample_rate (int): Sample rate of the audio
+        options (dict): transcribe keyword arguments
+        
+    Returns:
+        list: Segment texts for each utterance, in order
+    """
+    starts = np.cumsum([0] + [len(pcm) for pcm in pcms])
+    clips = [{'start': int(starts[i]), 'end': int(starts[i + 1])} for i in range(len(pcms))]
+    segments, _ = pipeline.transcribe(
+        np.concatenate(pcms),
+        clip_timestamps=clips,
+        batch_size=len(pcms),
+        **options
+    )
+    
+    texts = [[] for _ in pcms]
+    start_times = starts[:-1] / sample_rate
+    for segment in segments:
+        index = int(np.searchsorted(start_times, segment.start + 1e-3, side='right')) - 1
+        texts[max(index, 0)].append(segment.text)
+    return texts
+
+def _asr_process_main(model_kwargs, pcm_q, text_q, sample_rate=16000):
+    """Entry point of the ASR child process
+    
+    Owns the Whisper model and transcribes the audio the parent leaves in
+    shared memory, one job at a time. A job with several utterances is run
+    as one batch.
+    
+    Args:
+        model_kwargs (dict): WhisperModel constructor arguments
+        pcm_q (multiprocessing.Queue): (shm_name, lengths, options) jobs, None to stop
+        text_q (multiprocessing.Queue): (segment_texts per utterance, error) replies
+        sample_rate (int, optional): Sample rate of the audio. Defaults to 16000.
+    """
+    model = WhisperModel(**model_kwargs)
+    pipeline = None
+    buffers = {}
+    try:
+        while True:
+            job = pcm_q.get()
+            if job is None:
+                break
+            shm_name, lengths, options = job
+            try:
+                if shm_name not in buffers:
+                    buffers[shm_name] = shared_memory.SharedMemory(name=shm_name)
+                audio = np.ndarray((sum(lengths),), dtype=np.float32, buffer=buffers[shm_name].buf)
+                if len(lengths) == 1:
+                    segments, _ = model.transcribe(audio, **options)
+                    texts = [[segment.text for segment in segments]]
+                else:
+                    if pipeline is None:
+                        pipeline = BatchedInferencePipeline(model=model)
+                    bounds = np.cumsum([0] + list(lengths))
+                    pcms = [audio[bounds[i]:bounds[i + 1]] for i in range(len(lengths))]
+                    texts = _transcribe_batch(pipeline, pcms, sample_rate, options)
+                    del pcms
+                # Drop the view so the block can be closed on shutdown
+                del audio
+                text_q.put((texts, None))
+            except Exception as e:
+                text_q.put(([], str(e)))
+    finally:
+        for shm in buffers.values():
+            shm.close()
+
+class _ASRProcess:
+    """Runs Whisper in a child process so inference does not hold the parent's GIL
+    
+    Audio is copied into a shared memory block allocated once; only its name
+    and length cross the queue. transcribe() mirrors WhisperModel.transcribe
+    so callers work with either.
+    """
+    
+    _SHM_SECONDS = 60  # room for a full batch of phrases
+    _REPLY_POLL = 1.0  # seconds between child liveness checks while waiting
+    
+    def __init__(self, model_kwargs, sample_rate):
+        context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._shm = shared_memory.SharedMemory(
+            create=True,
+            size=self._SHM_SECONDS * sample_rate * np.dtype(np.float32).itemsize
+        )
+        self._buffer = np.ndarray((self._SHM_SECONDS * sample_rate,), dtype=np.float32, buffer=self._shm.buf)
+        self._pcm_q = context.Queue()
+        self._text_q = context.Queue()
+        self._sample_rate = sample_rate
+        self._process = context.Process(
+            target=_asr_process_main,
+            args=(model_kwargs, self._pcm_q, self._text_q, sample_rate),
+            name="buddy-asr-process",
+            daemon=True
+        )
+        self._process.start()
+    
+    def transcribe(self, pcm, **options):
+        """Transcribe audio in the child process
+        
+        Args:
+            pcm (np.ndarray): float32 samples
+            **options: WhisperModel.transcribe keyword arguments
+            
+        Returns:
+            tuple: (segments, None) where each segment has a text attribute
+        """
+        texts = self._run([pcm], options)[0]
+        return [SimpleNamespace(text=text) for text in texts], None
+    
+    def transcribe_batch(self, pcms, **options):
+        """Transcribe several utterances as one batch in the child process
+        
+        Args:
+            pcms (list): float32 arrays, one per utterance
+            **options: transcribe keyword arguments
+            
+        Returns:
+            list: Segment texts for each utterance, in order
+        """
+        return self._run(pcms, options)
+    
+    def _run(self, pcms, options):
+        """Copy the audio into shared memory and wait for the child's reply"""
+        lengths = [len(pcm) for pcm in pcms]
+        if sum(lengths) > len(self._buffer):
+            raise ValueError(f"Audio too long for the ASR buffer: {sum(lengths)} samples")
+        
+        with self._lock:
+            offset = 0
+            for pcm in pcms:
+                self._buffer[offset:offset + len(pcm)] = pcm
+                offset += len(pcm)
+            self._pcm_q.put((self._shm.name, lengths, options))
+            while True:
+                try:
+                    texts, error = self._text_q.get(timeout=self._REPLY_POLL)
+                    break
+                except queue.Empty:
+                    if not self._process.is_alive():
+                        raise RuntimeError(f"ASR process exited ({self._process.exitcode})")
+        
+        if error:
+            raise RuntimeError(f"ASR process error: {error}")
+        return texts
+    
+    def close(self):
+        """Stop the child process and release the shared memory"""
+        try:
+            self._pcm_q.put(None)
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.terminate()
+        except Exception as e:
+            logger.error(f"Error stopping ASR process: {e}")
+        finally:
+            self._shm.close()
+            self._shm.unlink()
+
 class SpeechHandler:
+    _ASR_MODEL = "base"
+    _ASR_SUBPROCESS = True  # run Whisper in a child process
+    _WARMUP_SECONDS = 5
+    _WARMUP_TIMEOUT = 10  # seconds the listen thread waits for the warm-up
+    _SAY_CMD = ['say', '-r', '225', '-v', 'Alex']
+    _SYNTH_RATE = 0.55  # AVSpeechUtterance rate, close to say -r 225
+    _SAY_LINE_CHARS = 250  # longest line written to say, well under the tty's MAX_CANON
+    _SPEAK_DEDUP_WINDOW = 0.5  # seconds in which a repeated message is dropped
+    _TTS_CACHE_DIR = "~/.cache/buddy/tts"
+    _TTS_CACHE_MAX_BYTES = 100 * 1024 * 1024
+    _TTS_RECENT_MAX = 64  # messages remembered to spot repeats worth caching
+    _TTS_RENDER_TIMEOUT = 10  # seconds allowed to render one message to the cache
+    _CALIBRATION_SECONDS = 0.3  # ambient noise sampled for the energy threshold
+    _ENERGY_CACHE = "~/.cache/buddy/energy_threshold"
+    _SAMPLE_RATE = 16000
+    _STREAM_STEP = 1.0  # seconds of new audio between partial transcriptions
+    _STREAM_WINDOW = 5.0  # longest phrase, matches the old phrase_time_limit
+    _STREAM_QUEUE_MAX = 256  # captured chunks buffered ahead of the recognizer
+    _RING_SECONDS = 30  # audio held by the sounddevice ring buffer
+    _BATCH_MAX = 8  # phrases transcribed together when recognition falls behind
+    _BATCH_WAIT = 0.05  # seconds to wait for a queued phrase to finish
+    _PHRASE_QUEUE_MAX = 8  # captured phrases waiting for the fallback recognizer
+    
+    # openai-whisper model for the fallback recognizer, shared by all handlers
+    _whisper_model = None
+    _whisper_lock = threading.Lock()
+    _VAD_FRAME = 480  # 30 ms at 16 kHz
+    _VAD_WINDOW = 10  # frames in the rolling speech ratio that opens a phrase
+    _VAD_START_RATIO = 0.5
+    _VAD_HANGOVER = 0.3  # seconds of non-speech that close a phrase
+    _VAD_MIN_VOICED = 0.2  # seconds of speech needed before running Whisper
+    
     def __init__(self, speech_callback):
         try:
             self.recognizer = sr.Recognizer()
             self.speech_callback = speech_callback
+            
+            # faster-whisper model, loaded once on first use and kept
+            # for the lifetime of the handler
+            self.asr = None
+            self.batched = None  # BatchedInferencePipeline over an in-process model
+            self._asr_lock = threading.Lock()
+            self.asr_ready = threading.Event()
+            
+            # One event loop thread runs the TTS worker and the streaming
+            # recognizer; blocking calls go to the loop's default executor
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name="buddy-speech", daemon=True)
+            self._loop_thread.start()
+            
+            # Streaming capture hands audio chunks to the recognizer task
+            self._audio_queue = None
+            self.asr_task = None
+            
+            # float32 buffers reused for every phrase instead of allocating
+            # fresh arrays per utterance; the stream window has one second
+            # of headroom for the chunk that fills it
+            self._pcm_scratch = np.empty(self._SAMPLE_RATE * 6, dtype=np.float32)
+            self._stream_window = np.empty(int(self._SAMPLE_RATE * (self._STREAM_WINDOW + 1)), dtype=np.float32)
+            
+            # Voice activity detection gates Whisper and sets phrase
+            # boundaries when webrtcvad is installed
+            self.vad = webrtcvad.Vad(2) if webrtcvad is not None else None
+            
             self.listening = False
             self.listen_thread = None
             self.wake_word = "hey buddy"  # Default wake word
@@ -19,21 +355,44 @@ class SpeechHandler:
             
             # TTS related initialization
             self.tts_lock = threading.Lock()
-            self.tts_queue = queue.Queue()
+            self.tts_queue = asyncio.Queue()
+            self._last_spoken = (None, 0.0)  # (text, monotonic time) of the last speak()
             self.shutdown_event = threading.Event()
             self.current_process = None
+            self.say_proc = None  # long-lived say reading utterances from stdin
+            self.synth = None  # in-process AVSpeechSynthesizer when PyObjC is available
+            self._synth_voice = None  # voice of the synthesizer's utterances
+            self._render_synth = None  # second synthesizer that renders to the cache
             self.engine_ready = threading.Event()
             
-            # Start TTS processing thread
-            self.tts_thread = threading.Thread(target=self._process_tts_queue, daemon=True)
-            self.tts_thread.start()
+            # Messages spoken more than once are rendered to audio files and
+            # played back with afplay instead of being synthesized again
+            self._tts_recent = collections.OrderedDict()
+            try:
+                self._tts_cache_dir = Path(self._TTS_CACHE_DIR).expanduser()
+                self._tts_cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"TTS cache disabled: {e}")
+                self._tts_cache_dir = None
+            
+            # Start TTS worker on the speech loop
+            self._tts_task = asyncio.run_coroutine_threadsafe(self._tts_worker(), self._loop)
             
             # TTS is ready immediately since we're using native command
             self.engine_ready.set()
+            if AVSpeechSynthesizer is not None:
+                self.synth = AVSpeechSynthesizer.alloc().init()
+                self._synth_voice = AVSpeechSynthesisVoice.voiceWithLanguage_(None)
+            else:
+                self._start_say_process()
             
             self.recognizer.dynamic_energy_threshold = True
             self.recognizer.energy_threshold = 4000
             
+            # Load and warm up Whisper in the background so the first
+            # phrase does not pay for it
+            self._loop.call_soon_threadsafe(self._loop.run_in_executor, None, self._warm_up_asr)
+            
         except Exception as e:
             self.cleanup()
             logger.error(f"Speech handler initialization failed: {e}")
@@ -41,13 +400,32 @@ class SpeechHandler:
 
     def _listen_loop(self):
         """Continuous listening loop with improved error handling"""
+        if not self.asr_ready.wait(timeout=self._WARMUP_TIMEOUT):
+            logger.warning("Whisper warm-up still running, starting to listen anyway")
+        
+        try:
+            streaming = self._get_asr() is not None
+        except Exception as e:
+            logger.error(f"Failed to load faster-whisper model: {e}")
+            streaming = False
+        
+        if streaming:
+            self._stream_loop()
+            return
+        
+        # Phrases are transcribed on a second thread so the next one is
+        # captured while the previous one is still in Whisper
+        phrases = queue.Queue(maxsize=self._PHRASE_QUEUE_MAX)
+        recognize_thread = threading.Thread(target=self._recognize_loop, args=(phrases,), name="buddy-recognize", daemon=True)
+        recognize_thread.start()
+        
         with sr.Microphone() as source:
-            logger.info("Calibrating for ambient noise...")
             try:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                self._calibrate(source)
                 logger.info("Ready! Listening for commands...")
                 
-                while self.listening and not self.shutdown_event.is_set():
+                shutdown_set = self.shutdown_event.is_set
+                while self.listening and not shutdown_set():
                     try:
                         # Reset error count on successful iteration
                         self.error_count = 0
@@ -55,25 +433,8 @@ class SpeechHandler:
                         
                         # Listen for audio with timeout
                         audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                        logger.debug("Audio captured, processing with Whisper...")
-                        
-                        try:
-                            # Process audio
-                            text = self.recognizer.recognize_whisper(audio, model="base").lower()
-                            
-                            if text:  # Process all recognized text
-                                logger.debug(f"Whisper recognition successful: {text}")
-                                self._handle_callback(text)
-                                
-                        except sr.UnknownValueError:
-                            logger.debug("No speech detected in audio")
-                            continue
-                    except sr.RequestError as e:
-                        logger.error(f"Speech recognition request error: {e}")
-                        if not self._handle_recognition_error(e):
-                            # Reset recognition if needed
-                            self._reset_recognition()
-                            continue
+                        logger.debug("Audio captured, queueing for Whisper...")
+                        phrases.put(audio)
                         
                     except sr.WaitTimeoutError:
                         # Normal timeout, continue listening
@@ -88,6 +449,557 @@ class SpeechHandler:
                 logger.error(f"Critical error in listening loop: {e}")
                 self.listening = False
                 self._reset_recognition()
+            finally:
+                phrases.put(None)
+                recognize_thread.join()
+    
+    def _recognize_loop(self, phrases):
+        """Transcribe phrases captured by the legacy listen loop
+        
+        Args:
+            phrases (queue.Queue): sr.AudioData from the listen loop; None ends the loop
+        """
+        while True:
+            audio = phrases.get()
+            if audio is None:
+                break
+            if not self.listening:
+                continue  # Drain what was captured before a fatal error
+            
+            try:
+                text = self._transcribe(audio)
+                if not text:
+                    logger.debug("No speech detected in audio")
+                    continue
+                
+                logger.debug("Whisper recognition successful: {}", text)
+                callback = self.speech_callback
+                if callback:
+                    try:
+                        callback(text)
+                    except Exception as e:
+                        logger.error(f"Error in speech callback: {e}")
+            except sr.RequestError as e:
+                logger.error(f"Speech recognition request error: {e}")
+                if not self._handle_recognition_error(e):
+                    # Reset recognition if needed
+                    self._reset_recognition()
+            except Exception as e:
+                logger.error(f"Error in speech recognition loop: {e}")
+                if not self._handle_recognition_error(e):
+                    self.listening = False
+
+    def _stream_loop(self):
+        """Capture microphone audio chunk by chunk for the streaming recognizer
+        
+        Chunks are converted to float32 samples here, overlapping with Whisper
+        running on the previous audio in the recognizer task.
+        
+        With webrtcvad installed, 30 ms frames are classified by the VAD: a
+        phrase opens once most of the recent frames are speech and closes after
+        _VAD_HANGOVER seconds of non-speech. Without it, the recognizer's energy
+        threshold and pause_threshold are used instead.
+        """
+        self._audio_queue = asyncio.Queue(maxsize=self._STREAM_QUEUE_MAX)
+        self.asr_task = asyncio.run_coroutine_threadsafe(self._asr_loop(), self._loop)
+        
+        chunk_size = self._VAD_FRAME if self.vad else 1024
+        try:
+            with self._open_capture(chunk_size) as read_chunk:
+                logger.info("Ready! Listening for commands...")
+                
+                seconds_per_chunk = chunk_size / self._SAMPLE_RATE
+                pause = self._VAD_HANGOVER if self.vad else self.recognizer.pause_threshold
+                pause_chunks = int(np.ceil(pause / seconds_per_chunk))
+                min_voiced_chunks = int(np.ceil(self._VAD_MIN_VOICED / seconds_per_chunk)) if self.vad else 0
+                pre_roll = collections.deque(
+                    maxlen=int(np.ceil(self.recognizer.non_speaking_duration / seconds_per_chunk))
+                )
+                recent = collections.deque(maxlen=self._VAD_WINDOW if self.vad else 1)
+                in_phrase = False
+                silent_chunks = 0
+                voiced_chunks = 0
+                
+                shutdown_set = self.shutdown_event.is_set
+                while self.listening and not shutdown_set():
+                    try:
+                        chunk = read_chunk()
+                        if chunk is None:
+                            continue
+                        # Convert here so the recognizer only has to run Whisper
+                        pcm = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
+                        speaking = self._is_speech(chunk, pcm)
+                        
+                        if not in_phrase:
+                            pre_roll.append(pcm)
+                            recent.append(speaking)
+                            if sum(recent) < self._VAD_START_RATIO * recent.maxlen:
+                                continue
+                            # Phrase started, send the audio that led into it as well
+                            in_phrase = True
+                            silent_chunks = 0
+                            voiced_chunks = sum(recent)
+                            recent.clear()
+                            for buffered in pre_roll:
+                                self._queue_audio(buffered)
+                            pre_roll.clear()
+                            continue
+                        
+                        self._queue_audio(pcm)
+                        if speaking:
+                            silent_chunks = 0
+                            voiced_chunks += 1
+                        else:
+                            silent_chunks += 1
+                        if silent_chunks >= pause_chunks:
+                            # Too little speech to be worth a Whisper pass
+                            too_short = voiced_chunks < min_voiced_chunks
+                            self._queue_audio(_PHRASE_DISCARD if too_short else None)
+                            in_phrase = False
+                    except Exception as e:
+                        logger.error(f"Error capturing audio: {e}")
+                        if not self._handle_recognition_error(e):
+                            break
+                        time.sleep(0.1)
+        except Exception as e:
+            logger.error(f"Critical error in listening loop: {e}")
+            self.listening = False
+            self._reset_recognition()
+        finally:
+            self._queue_audio(_STREAM_STOP)
+    
+    def _queue_audio(self, item):
+        """Hand a chunk or phrase marker to the recognizer task
+        
+        Blocks the capture thread while the queue is full.
+        
+        Args:
+            item: float32 chunk, None, _PHRASE_DISCARD or _STREAM_STOP
+        """
+        asyncio.run_coroutine_threadsafe(self._audio_queue.put(item), self._loop).result()
+    
+    @contextlib.contextmanager
+    def _open_capture(self, chunk_size):
+        """Open the microphone for streaming capture and calibrate the energy gate
+        
+        Uses a sounddevice input stream feeding an _AudioRing when sounddevice
+        is installed, and SpeechRecognition's PyAudio microphone otherwise.
+        
+        Args:
+            chunk_size (int): Samples returned per read
+            
+        Yields:
+            callable: Returns the next chunk as 16 kHz mono int16 bytes, or None
+            if no audio arrived in time
+        """
+        if sd is None:
+            with sr.Microphone(sample_rate=self._SAMPLE_RATE, chunk_size=chunk_size) as source:
+                if not self.vad:
+                    self._calibrate(source)
+                yield lambda: source.stream.read(source.CHUNK)
+            return
+        
+        ring = _AudioRing(self._RING_SECONDS * self._SAMPLE_RATE)
+        with sd.RawInputStream(
+            samplerate=self._SAMPLE_RATE,
+            channels=1,
+            dtype='int16',
+            blocksize=chunk_size,
+            callback=ring.callback
+        ):
+            read_chunk = lambda: ring.read(chunk_size, timeout=0.5)
+            if not self.vad and not self._load_energy_threshold():
+                # The VAD needs no calibration; the energy gate does
+                logger.info("Calibrating for ambient noise...")
+                levels = []
+                for _ in range(max(1, int(self._CALIBRATION_SECONDS * self._SAMPLE_RATE / chunk_size))):
+                    chunk = read_chunk()
+                    if chunk is not None:
+                        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+                        levels.append(np.sqrt(np.mean(samples * samples)))
+                if levels:
+                    self.recognizer.energy_threshold = float(np.mean(levels)) * self.recognizer.dynamic_energy_ratio
+                    self._save_energy_threshold()
+            yield read_chunk
+    
+    def _calibrate(self, source):
+        """Set the energy threshold from the saved value or from ambient noise
+        
+        Args:
+            source (sr.Microphone): Open microphone to sample
+        """
+        if self._load_energy_threshold():
+            return
+        logger.info("Calibrating for ambient noise...")
+        self.recognizer.adjust_for_ambient_noise(source, duration=self._CALIBRATION_SECONDS)
+        self._save_energy_threshold()
+    
+    def _load_energy_threshold(self):
+        """Apply the energy threshold saved by an earlier session
+        
+        Returns:
+            bool: True if a saved threshold was applied
+        """
+        try:
+            with open(os.path.expanduser(self._ENERGY_CACHE)) as f:
+                self.recognizer.energy_threshold = float(f.read())
+            logger.info(f"Using saved energy threshold {self.recognizer.energy_threshold:.0f}")
+            return True
+        except (OSError, ValueError):
+            return False
+    
+    def _save_energy_threshold(self):
+        """Save the calibrated energy threshold for the next session"""
+        try:
+            path = os.path.expanduser(self._ENERGY_CACHE)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(str(float(self.recognizer.energy_threshold)))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not save energy threshold: {e}")
+    
+    def _is_speech(self, chunk, pcm):
+        """Classify one captured chunk as speech or silence
+        
+        Args:
+            chunk (bytes): 16 kHz mono int16 audio
+            pcm (np.ndarray): The same audio as float32 samples in [-1, 1]
+            
+        Returns:
+            bool: True if the chunk contains speech
+        """
+        if self.vad:
+            return self.vad.is_speech(chunk, self._SAMPLE_RATE)
+        return np.sqrt(np.mean(pcm * pcm)) * 32768.0 > self.recognizer.energy_threshold
+    
+    def _voiced_seconds(self, raw):
+        """Measure how much of a buffer the VAD classifies as speech
+        
+        Args:
+            raw (bytes): 16 kHz mono int16 audio
+            
+        Returns:
+            float: Seconds of voiced audio
+        """
+        frame_bytes = self._VAD_FRAME * 2
+        voiced = sum(
+            self.vad.is_speech(raw[i:i + frame_bytes], self._SAMPLE_RATE)
+            for i in range(0, len(raw) - frame_bytes + 1, frame_bytes)
+        )
+        return voiced * self._VAD_FRAME / self._SAMPLE_RATE
+    
+    async def _asr_loop(self):
+        """Transcribe the current phrase on a sliding window as audio arrives
+        
+        Runs on the speech loop; Whisper passes and the speech callback run in
+        the loop's executor so TTS keeps being served meanwhile.
+        
+        A partial transcript is produced for every _STREAM_STEP seconds of new
+        audio. Words that two consecutive transcripts agree on are committed
+        (LocalAgreement-2); when the phrase closes with nothing left to
+        commit and no audio after the last partial, the last transcript is
+        used without another pass. Phrases
+        that finished queueing while recognition was behind are transcribed
+        in the same batch as the current one.
+        """
+        loop = asyncio.get_running_loop()
+        # The phrase is assembled in a buffer allocated once per handler
+        window = self._stream_window
+        window_samples = 0
+        new_samples = 0
+        step_samples = int(self._STREAM_STEP * self._SAMPLE_RATE)
+        max_samples = int(self._STREAM_WINDOW * self._SAMPLE_RATE)
+        previous = []
+        committed = []
+        backlog = collections.deque()  # chunks taken off the queue while batching
+        stopping = False
+        
+        while not stopping:
+            item = backlog.popleft() if backlog else await self._audio_queue.get()
+            if item is _STREAM_STOP:
+                break
+            
+            try:
+                if item is _PHRASE_DISCARD:
+                    logger.debug("Phrase had too little speech, skipping recognition")
+                    window_samples = new_samples = 0
+                    previous = []
+                    committed = []
+                    continue
+                
+                if item is not None:
+                    window[window_samples:window_samples + len(item)] = item
+                    window_samples += len(item)
+                    new_samples += len(item)
+                    
+                    if window_samples < max_samples:
+                        if new_samples >= step_samples:
+                            current = (await loop.run_in_executor(
+                                None, self._transcribe_pcm, window[:window_samples]
+                            )).split()
+                            committed = self._local_agreement(previous, current)
+                            previous = current
+                            new_samples = 0
+                            logger.opt(lazy=True).debug("Partial transcript: {}", lambda: " ".join(committed))
+                        continue
+                
+                # Phrase closed or the window is full: finish the phrase
+                if not window_samples:
+                    continue
+                if previous and committed == previous and new_samples == 0:
+                    texts = [" ".join(previous)]
+                else:
+                    # Batch it with any phrases already waiting behind it
+                    queued, leftover, stopping = await self._drain_phrases()
+                    texts = await loop.run_in_executor(
+                        None, self._transcribe_many, [window[:window_samples]] + queued
+                    )
+                    backlog.extend(leftover)
+                
+                window_samples = new_samples = 0
+                previous = []
+                committed = []
+                
+                callback = self.speech_callback
+                for text in texts:
+                    if not text:
+                        logger.debug("No speech detected in audio")
+                        continue
+                    logger.debug("Whisper recognition successful: {}", text)
+                    if callback:
+                        try:
+                            await loop.run_in_executor(None, callback, text)
+                        except Exception as e:
+                            logger.error(f"Error in speech callback: {e}")
+            except Exception as e:
+                logger.error(f"Error in streaming recognition: {e}")
+                window_samples = new_samples = 0
+                previous = []
+                committed = []
+                if not await loop.run_in_executor(None, self._handle_recognition_error, e):
+                    await loop.run_in_executor(None, self._reset_recognition)
+    
+    async def _drain_phrases(self):
+        """Take phrases that have finished queueing off the ASR queue
+        
+        Only waits when audio is already backed up behind the current phrase.
+        
+        Returns:
+            tuple: (complete phrases as float32 arrays, chunks of a phrase still
+            being captured, whether the stream has ended)
+        """
+        phrases = []
+        pending = []
+        if self._audio_queue.empty():
+            return phrases, pending, False
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._BATCH_WAIT
+        while len(phrases) < self._BATCH_MAX - 1:
+            try:
+                item = self._audio_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._audio_queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STREAM_STOP:
+                return phrases, pending, True
+            if item is _PHRASE_DISCARD:
+                pending = []
+            elif item is None:
+                if pending:
+                    phrases.append(np.concatenate(pending))
+                pending = []
+            else:
+                pending.append(item)
+        return phrases, pending, False
+    
+    @staticmethod
+    def _local_agreement(previous, current):
+        """Return the words two consecutive transcripts agree on
+        
+        Args:
+            previous (list): Words of the earlier transcript
+            current (list): Words of the latest transcript
+            
+        Returns:
+            list: Longest common prefix of both transcripts
+        """
+        committed = []
+        for old_word, new_word in zip(previous, current):
+            if old_word != new_word:
+                break
+            committed.append(new_word)
+        return committed
+    
+    def _get_asr(self):
+        """Return the persistent faster-whisper model, loading it on first use
+        
+        Returns:
+            WhisperModel: The shared model (an _ASRProcess proxy when Whisper runs
+            in a child process), or None if faster-whisper is not installed
+        """
+        if WhisperModel is None:
+            return None
+        if self.asr is None:
+            with self._asr_lock:
+                if self.asr is None:
+                    device, compute_type = self._asr_device()
+                    logger.info(f"Loading faster-whisper '{self._ASR_MODEL}' model ({device}, {compute_type})...")
+                    model_kwargs = {
+                        'model_size_or_path': self._ASR_MODEL,
+                        'device': device,
+                        'compute_type': compute_type,
+                        'cpu_threads': min(4, os.cpu_count() or 1)
+                    }
+                    if self._ASR_SUBPROCESS:
+                        self.asr = _ASRProcess(model_kwargs, self._SAMPLE_RATE)
+                    else:
+                        self.asr = WhisperModel(**model_kwargs)
+        return self.asr
+    
+    def _warm_up_asr(self):
+        """Load the Whisper model and run one inference on silence
+        
+        The first inference is several times slower than the following ones;
+        doing it here keeps that cost out of the first real phrase.
+        """
+        try:
+            silence = np.zeros(self._SAMPLE_RATE * self._WARMUP_SECONDS, dtype=np.float32)
+            asr = self._get_asr()
+            if asr is not None:
+                segments, _ = asr.transcribe(silence, language="en", beam_size=1)
+                list(segments)
+            elif self._get_whisper() is not None:
+                self._get_whisper().transcribe(silence, language="en", fp16=False)
+            else:
+                return
+            logger.info("Whisper model warmed up")
+        except Exception as e:
+            logger.error(f"Whisper warm-up failed: {e}")
+        finally:
+            self.asr_ready.set()
+    
+    @classmethod
+    def _get_whisper(cls):
+        """Return the openai-whisper model used when faster-whisper is missing
+        
+        recognize_whisper loads the model again on every call; this one is
+        loaded once per process and kept.
+        
+        Returns:
+            whisper.Whisper: The shared model, or None if openai-whisper is
+            not installed
+        """
+        if cls._whisper_model is None:
+            with cls._whisper_lock:
+                if cls._whisper_model is None:
+                    try:
+                        import whisper  # imported here, it pulls in torch
+                    except ImportError:
+                        cls._whisper_model = False
+                    else:
+                        logger.info(f"Loading Whisper '{cls._ASR_MODEL}' model...")
+                        cls._whisper_model = whisper.load_model(cls._ASR_MODEL)
+        return cls._whisper_model if cls._whisper_model is not False else None
+    
+    @staticmethod
+    def _asr_device():
+        """Pick the inference device and quantized compute type for Whisper
+        
+        Returns:
+            tuple: ("cuda", "int8_float16") with a CUDA device, ("cpu", "int8") otherwise
+        """
+        try:
+            if ctranslate2 is not None and ctranslate2.get_cuda_device_count() > 0:
+                return "cuda", "int8_float16"
+        except Exception as e:
+            logger.debug(f"CUDA device query failed: {e}")
+        return "cpu", "int8"
+    
+    def _transcribe(self, audio):
+        """Transcribe a captured phrase
+        
+        Args:
+            audio (sr.AudioData): Audio captured from the microphone
+            
+        Returns:
+            str: Lowercase transcript, or an empty string if no speech was recognized
+        """
+        raw = None
+        if self.vad:
+            raw = audio.get_raw_data(convert_rate=self._SAMPLE_RATE, convert_width=2)
+            if self._voiced_seconds(raw) < self._VAD_MIN_VOICED:
+                return ""
+        
+        asr = self._get_asr()
+        whisper_model = self._get_whisper() if asr is None else None
+        if asr is None and whisper_model is None:
+            try:
+                return self.recognizer.recognize_whisper(audio, model=self._ASR_MODEL).strip().lower()
+            except sr.UnknownValueError:
+                return ""
+        
+        if raw is None:
+            raw = audio.get_raw_data(convert_rate=self._SAMPLE_RATE, convert_width=2)
+        n_samples = len(raw) // 2
+        if n_samples > len(self._pcm_scratch):
+            # Longer than any phrase listen() should return, convert into a new array
+            pcm = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        else:
+            pcm = self._pcm_scratch[:n_samples]
+            pcm[:] = np.frombuffer(raw, dtype=np.int16, count=n_samples)
+            pcm *= 1.0 / 32768.0
+        
+        if whisper_model is not None:
+            result = whisper_model.transcribe(pcm, language="en", fp16=False, condition_on_previous_text=False)
+            return result["text"].strip().lower()
+        return self._transcribe_pcm(pcm)
+    
+    def _transcribe_many(self, pcms):
+        """Transcribe several phrases, batching them when more than one is given
+        
+        Args:
+            pcms (list): float32 arrays, one per phrase
+            
+        Returns:
+            list: Lowercase transcript of each phrase, in order
+        """
+        if len(pcms) == 1 or BatchedInferencePipeline is None:
+            return [self._transcribe_pcm(pcm) for pcm in pcms]
+        
+        logger.debug(f"Transcribing {len(pcms)} queued phrases as one batch")
+        options = {'language': "en", 'beam_size': 1, 'vad_filter': False, 'condition_on_previous_text': False}
+        asr = self._get_asr()
+        if isinstance(asr, _ASRProcess):
+            texts = asr.transcribe_batch(pcms, **options)
+        else:
+            if self.batched is None:
+                self.batched = BatchedInferencePipeline(model=asr)
+            texts = _transcribe_batch(self.batched, pcms, self._SAMPLE_RATE, options)
+        return [" ".join(parts).strip().lower() for parts in texts]
+    
+    def _transcribe_pcm(self, pcm):
+        """Transcribe 16 kHz mono audio with the faster-whisper model
+        
+        Args:
+            pcm (np.ndarray): float32 samples in [-1, 1]
+            
+        Returns:
+            str: Lowercase transcript, or an empty string if no speech was recognized
+        """
+        segments, _ = self._get_asr().transcribe(
+            pcm,
+            language="en",
+            beam_size=1,
+            vad_filter=False,
+            condition_on_previous_text=False
+        )
+        return " ".join(segment.text for segment in segments).strip().lower()
 
     def _reset_recognition(self):
         """Reset recognition state after errors"""
@@ -95,10 +1007,15 @@ class SpeechHandler:
             logger.info("Resetting speech recognition...")
             self.error_count = 0
             
-            # Reinitialize recognizer with default settings
-            self.recognizer = sr.Recognizer()
-            self.recognizer.dynamic_energy_threshold = True
+            # Restore the default settings on the existing recognizer
             self.recognizer.energy_threshold = 4000
+            self.recognizer.dynamic_energy_threshold = True
+            self.recognizer.pause_threshold = 0.8
+            
+            # Recalibrate next session instead of reusing a threshold that
+            # may be what went wrong
+            with contextlib.suppress(OSError):
+                os.remove(os.path.expanduser(self._ENERGY_CACHE))
             
             # Notify user
             if self.speech_callback:
@@ -110,48 +1027,330 @@ class SpeechHandler:
             logger.error(f"Failed to reset recognition: {e}")
             # Continue with existing recognizer
 
-    def _process_tts_queue(self):
-        """Process TTS messages using macOS say command"""
-        while not self.shutdown_event.is_set():
+    async def _tts_worker(self):
+        """Speak queued messages on the speech loop
+        
+        Handing text to the native synthesizer or the persistent say process
+        returns immediately; only the per-message say fallback, which waits
+        for playback, runs in the executor.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            # Sleep until there is text to speak; cleanup() ends the
+            # worker with None
+            text = await self.tts_queue.get()
             try:
-                # Get text from queue with timeout
-                text = self.tts_queue.get(timeout=1)
                 if text is None:  # Shutdown signal
                     break
                 
+                # Repeated messages play from the audio cache
+                cached = self._tts_cache_path(text)
+                if cached is not None and await loop.run_in_executor(None, self._play_cached, text, cached):
+                    continue
+                
+                # Queue the utterance on the native synthesizer or hand the
+                # line to the running say process; both speak it once the
+                # previous utterances are done
                 with self.tts_lock:
-                    try:
-                        # Stop any current speech
-                        self._stop_current_speech()
-                        
-                        # Use say command with system voice
-                        cmd = ['say', '-r', '225', '-v', 'Alex', text]
-                        self.current_process = subprocess.Popen(
-                            cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE
-                        )
-                        
-                        # Wait for speech to complete
-                        self.current_process.wait()
-                        if self.current_process.returncode != 0:
-                            stderr = self.current_process.stderr.read().decode().strip()
-                            logger.error(f"TTS error: {stderr}")
-                    except Exception as e:
-                        logger.error(f"TTS error: {e}")
-                    finally:
-                        self.current_process = None
+                    handed_off = self._speak_native(text) or self._say_line(text)
+                if not handed_off:
+                    await loop.run_in_executor(None, self._say_once, text)
                 
+            except Exception as e:
+                logger.error(f"TTS queue processing error: {e}")
+                await asyncio.sleep(0.1)
+            finally:
                 self.tts_queue.task_done()
+    
+    def _say_once(self, text):
+        """Speak one message with its own say process and wait for it
+        
+        Args:
+            text (str): Text to be spoken
+        """
+        with self.tts_lock:
+            try:
+                # Stop any current speech
+                self._stop_current_speech()
+                
+                # Use say command with system voice
+                cmd = self._SAY_CMD + [text]
+                self.current_process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE
+                )
                 
-            except queue.Empty:
-                continue
+                # Wait for speech to complete, stderr is only decoded on failure
+                _, err = self.current_process.communicate()
+                if self.current_process.returncode:
+                    logger.error(f"TTS error: {err.decode(errors='ignore').strip()}")
             except Exception as e:
-                logger.error(f"TTS queue processing error: {e}")
-                time.sleep(0.1)
+                logger.error(f"TTS error: {e}")
+            finally:
+                self.current_process = None
+    
+    def _tts_voice_key(self):
+        """Describe the engine, voice and rate that speak live messages
+        
+        Returns:
+            str: Part of the cache key, so a voice change renders anew
+        """
+        if self.synth is not None:
+            voice = self._synth_voice.identifier() if self._synth_voice is not None else 'default'
+            return f"avspeech {voice} {self._SYNTH_RATE}"
+        return " ".join(self._SAY_CMD)
+    
+    def _tts_cache_path(self, text):
+        """Return the cache file to play text from, or None to synthesize it
+        
+        A message is rendered to the cache the second time it is spoken.
+        The cache is skipped while the persistent say process is in use,
+        since there is no way to tell when it has finished the lines
+        already written to it and playback would overlap them.
+        
+        Args:
+            text (str): Text to be spoken
+            
+        Returns:
+            Path: Cached (or to be rendered) audio file, or None
+        """
+        if self._tts_cache_dir is None or self.say_proc is not None:
+            return None
+        
+        key = hashlib.sha1(f"{self._tts_voice_key()}\0{text}".encode()).hexdigest()[:16]
+        path = self._tts_cache_dir / f"{key}.caf"
+        if path.exists() or key in self._tts_recent:
+            return path
+        
+        self._tts_recent[key] = True
+        if len(self._tts_recent) > self._TTS_RECENT_MAX:
+            self._tts_recent.popitem(last=False)
+        return None
+    
+    def _play_cached(self, text, path):
+        """Play a message from the audio cache, rendering it first if needed
+        
+        Args:
+            text (str): Text to be spoken
+            path (Path): Cache file for the text
+            
+        Returns:
+            bool: True if the message was played
+        """
+        try:
+            if path.exists():
+                os.utime(path)  # mtime orders the LRU eviction
+            else:
+                tmp = path.with_suffix(".tmp.caf")
+                self._render_tts(text, tmp)
+                os.replace(tmp, path)
+                self._evict_tts_cache()
+            
+            # Let the synthesizer finish what it is already saying
+            while self.synth is not None and self.synth.isSpeaking():
+                time.sleep(0.02)
+            
+            with self.tts_lock:
+                self.current_process = subprocess.Popen(
+                    ['afplay', str(path)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE
+                )
+                _, err = self.current_process.communicate()
+                if self.current_process.returncode:
+                    logger.error(f"TTS cache playback error: {err.decode(errors='ignore').strip()}")
+                    return False
+            return True
+        except Exception as e:
+            logger.error(f"TTS cache error: {e}")
+            return False
+        finally:
+            self.current_process = None
+    
+    def _render_tts(self, text, path):
+        """Render a message to an audio file with the engine that speaks it live
+        
+        Args:
+            text (str): Text to be spoken
+            path (Path): Audio file to write
+        """
+        if self.synth is None:
+            # Text goes through stdin so a leading "-" is not read as an option
+            subprocess.run(self._SAY_CMD + ['-o', str(path), '-f', '/dev/stdin'],
+                           input=text.encode(), check=True, capture_output=True)
+            return
+        
+        if self._render_synth is None:
+            self._render_synth = AVSpeechSynthesizer.alloc().init()
+        done = threading.Event()
+        audio_file = []
+        
+        def write_buffer(buffer):
+            # An empty buffer marks the end of the utterance
+            if buffer.frameLength() == 0:
+                done.set()
+                return
+            if not audio_file:
+                url = NSURL.fileURLWithPath_(str(path))
+                audio_file.append(AVAudioFile.alloc().initForWriting_settings_error_(
+                    url, buffer.format().settings(), None)[0])
+            audio_file[0].writeFromBuffer_error_(buffer, None)
+        
+        self._render_synth.writeUtterance_toBufferCallback_(self._utterance(text), write_buffer)
+        if not done.wait(self._TTS_RENDER_TIMEOUT):
+            raise TimeoutError("Rendering speech to the cache timed out")
+        audio_file.clear()  # Releasing the AVAudioFile finishes the file
+        if not path.exists():
+            raise OSError(f"No audio rendered for: {text}")
+    
+    def _evict_tts_cache(self):
+        """Delete the least recently played cache files above the size limit"""
+        files = sorted(self._tts_cache_dir.glob("*.caf"), key=lambda f: f.stat().st_mtime)
+        total = sum(f.stat().st_size for f in files)
+        for f in files:
+            if total <= self._TTS_CACHE_MAX_BYTES:
+                break
+            total -= f.stat().st_size
+            f.unlink(missing_ok=True)
+    
+    def _start_say_process(self):
+        """Start the long-lived say process that speaks lines written to its stdin
+        
+        say only speaks line by line when its input is a terminal; from a
+        pipe it reads everything up to EOF first. Its stdin is therefore
+        the slave end of a pty, with echo off so nothing collects on the
+        master end, and say_proc.stdin writes to the master.
+        
+        Returns:
+            bool: True if the process is running
+        """
+        if pty is None:
+            self.say_proc = None
+            return False
+        try:
+            master, slave = pty.openpty()
+            try:
+                attrs = termios.tcgetattr(slave)
+                attrs[3] &= ~termios.ECHO
+                termios.tcsetattr(slave, termios.TCSANOW, attrs)
+                proc = subprocess.Popen(
+                    self._SAY_CMD + ['-f', '/dev/stdin'],
+                    stdin=slave,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+            except Exception:
+                os.close(master)
+                raise
+            finally:
+                os.close(slave)
+            proc.stdin = open(master, 'wb', buffering=0)
+            self.say_proc = proc
+            return True
+        except Exception as e:
+            logger.warning(f"Could not start persistent say process, speaking per message: {e}")
+            self.say_proc = None
+            return False
+    
+    def _end_say_input(self, proc, timeout):
+        """Send EOF to a say process and wait for it to speak what it has
+        
+        Args:
+            proc (subprocess.Popen): say process from _start_say_process
+            timeout (float): Longest wait in seconds before it is killed
+        """
+        try:
+            proc.stdin.write(b"\x04")  # EOF at the start of a line
+            proc.wait(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error closing say process: {e}")
+            try:
+                proc.kill()
+            except:
+                pass
+        finally:
+            proc.stdin.close()
+    
+    def _speak_native(self, text):
+        """Queue an utterance on the in-process AVSpeechSynthesizer
+        
+        Args:
+            text (str): Text to be spoken
+            
+        Returns:
+            bool: True if the synthesizer took the utterance
+        """
+        if self.synth is None:
+            return False
+        self.synth.speakUtterance_(self._utterance(text))
+        return True
+    
+    def _utterance(self, text):
+        """Build an utterance with the voice and rate used for all speech
+        
+        Args:
+            text (str): Text to be spoken
+            
+        Returns:
+            AVSpeechUtterance: Utterance for the synthesizer
+        """
+        utterance = AVSpeechUtterance.speechUtteranceWithString_(text)
+        utterance.setRate_(self._SYNTH_RATE)
+        if self._synth_voice is not None:
+            utterance.setVoice_(self._synth_voice)
+        return utterance
+    
+    def _say_line(self, text):
+        """Send one utterance to the persistent say process
+        
+        Args:
+            text (str): Text to be spoken
+            
+        Returns:
+            bool: True if the text was handed to say, False if it is not running
+        """
+        if self.say_proc is None:
+            return False
+        if self.say_proc.poll() is not None:
+            logger.warning(f"Persistent say process exited ({self.say_proc.returncode}), restarting")
+            if not self._start_say_process():
+                return False
+        
+        proc = self.say_proc
+        try:
+            # One short line per write; the terminal caps the line length
+            for line in textwrap.wrap(" ".join(text.split()), self._SAY_LINE_CHARS):
+                proc.stdin.write((line + "\n").encode())
+            return True
+        except (BrokenPipeError, OSError) as e:
+            logger.error(f"TTS error: {e}")
+            if self.say_proc is proc:  # Keep a replacement started meanwhile
+                self.say_proc = None
+            return False
     
     def _stop_current_speech(self):
         """Stop current speech process if running"""
+        if self.synth is not None:
+            # Stops immediately and drops the queued utterances
+            self.synth.stopSpeakingAtBoundary_(0)
+        
+        if self.say_proc and self.say_proc.poll() is None:
+            # Interrupting say also drops the lines it has not spoken yet
+            try:
+                self.say_proc.send_signal(signal.SIGINT)
+                self.say_proc.stdin.close()
+                self.say_proc.wait(timeout=1)
+            except Exception as e:
+                logger.error(f"Error stopping speech process: {e}")
+                try:
+                    self.say_proc.kill()
+                except:
+                    pass
+            self.say_proc = None
+            if not self.shutdown_event.is_set():
+                self._start_say_process()
+        
         if self.current_process:
             try:
                 self.current_process.terminate()
@@ -164,14 +1363,68 @@ class SpeechHandler:
                     pass
             self.current_process = None
     
-    def speak(self, text):
+    def speak(self, text, priority=False):
         """Add text to TTS queue
         
+        A message identical to the previous one within _SPEAK_DEDUP_WINDOW
+        seconds is dropped.
+        
         Args:
             text (str): Text to be spoken
+            priority (bool, optional): Stop current speech and drop queued
+                messages before speaking. Defaults to False.
+        """
+        if not text or self.tts_queue is None or self.shutdown_event.is_set():
+            return
+        
+        now = time.monotonic()
+        last_text, last_time = self._last_spoken
+        if not priority and text == last_text and now - last_time < self._SPEAK_DEDUP_WINDOW:
+            logger.debug("Dropping repeated message: {}", text)
+            return
+        self._last_spoken = (text, now)
+        
+        if priority:
+            self._loop.call_soon_threadsafe(self._interrupt_speech)
+        self._loop.call_soon_threadsafe(self.tts_queue.put_nowait, text)
+    
+    def _interrupt_speech(self):
+        """Drop queued messages and stop current speech
+        
+        Runs on the speech loop, so it cannot interleave with the worker
+        writing a line to the say process.
         """
-        if text and self.tts_queue and not self.shutdown_event.is_set():
-            self.tts_queue.put(text)
+        while not self.tts_queue.empty():
+            self.tts_queue.get_nowait()
+            self.tts_queue.task_done()
+        self._stop_current_speech()
+    
+    def finish_speaking(self, timeout=3.0):
+        """Wait until queued messages have been spoken
+        
+        Call before cleanup() so a last message, such as a goodbye, is not
+        cut off.
+        
+        Args:
+            timeout (float, optional): Longest wait in seconds. Defaults to 3.0.
+        """
+        deadline = time.monotonic() + timeout
+        drained = asyncio.run_coroutine_threadsafe(self.tts_queue.join(), self._loop)
+        try:
+            drained.result(timeout=timeout)
+        except Exception:
+            drained.cancel()
+            logger.warning("TTS queue not drained before shutdown")
+            return
+        
+        while self.synth is not None and self.synth.isSpeaking() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        
+        # say exits once it has spoken everything written before EOF
+        proc = self.say_proc
+        if proc is not None and proc.poll() is None:
+            self.say_proc = None
+            self._end_say_input(proc, max(0.0, deadline - time.monotonic()))
     
     def cleanup(self):
         """Clean up all resources properly"""
@@ -179,25 +1432,33 @@ class SpeechHandler:
         self.shutdown_event.set()
         self.stop_listening()
         
+        # Stop the ASR child process
+        if isinstance(self.asr, _ASRProcess):
+            self.asr.close()
+            self.asr = None
+        
         # Stop current speech
         self._stop_current_speech()
         
         # Clean up TTS resources
-        if self.tts_queue:
+        if self.tts_queue is not None and self._loop.is_running():
             try:
-                self.tts_queue.put(None)  # Signal shutdown
-                if self.tts_thread and self.tts_thread.is_alive():
-                    self.tts_thread.join(timeout=2)
+                self._loop.call_soon_threadsafe(self.tts_queue.put_nowait, None)  # Signal shutdown
+                self._tts_task.result(timeout=2)
             except Exception as e:
                 logger.error(f"Error cleaning up TTS queue: {e}")
-            finally:
-                # Clear the queue
-                while not self.tts_queue.empty():
-                    try:
-                        self.tts_queue.get_nowait()
-                        self.tts_queue.task_done()
-                    except queue.Empty:
-                        break
+        
+        # Let say exit once its input has ended
+        if self.say_proc:
+            proc, self.say_proc = self.say_proc, None
+            self._end_say_input(proc, 2)
+        
+        # Stop the speech loop
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=2)
+        if not self._loop.is_running() and not self._loop.is_closed():
+            self._loop.close()
 
     def start_listening(self):
         """Start listening for speech in a separate thread
@@ -231,20 +1492,28 @@ class SpeechHandler:
                     logger.error(f"Error stopping listen thread: {e}")
                 finally:
                     self.listen_thread = None
+            if self.asr_task is not None:
+                try:
+                    self.asr_task.result(timeout=2)
+                except Exception as e:
+                    logger.error(f"Error stopping ASR task: {e!r}")
+                finally:
+                    self.asr_task = None
             self.active_listening = False
     
     def _handle_callback(self, text):
         """Handle speech recognition callback safely
         
+        The listening loops call speech_callback directly; this wrapper is
+        kept for callers outside the hot path.
+        
         Args:
             text (str): The recognized text to process
         """
-        logger.debug(f"Speech recognition received text: {text}")
+        logger.debug("Speech recognition received text: {}", text)
         if self.speech_callback:
             try:
-                logger.debug(f"Sending text to callback handler: {text}")
                 self.speech_callback(text)
-                logger.debug("Callback handler processed text successfully")
             except Exception as e:
                 logger.error(f"Error in speech callback: {str(e)}")
                 logger.error(f"Exception type: {type(e).__name__}")
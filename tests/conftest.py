@@ -0,0 +1,5 @@
+import sys
+import os
+
+# Make the project modules importable from the tests, once for the whole session
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
\ No newline at end of file
@@ -1,11 +1,7 @@
-import sys
-import os
+import asyncio
 import pytest
 from unittest.mock import MagicMock, patch
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Import module to test
 from modules.chat_interface import ChatInterface
 
@@ -38,7 +34,7 @@ class TestChatInterface:
         assert len(chat.message_history) == 1
         assert chat.message_history[0] == ("Buddy", "Welcome to Buddy! How can I help you today?")
         assert chat.command_callback == mock_callback
-        assert mock_thread.called
+        assert chat._loop is not None
         assert chat.app is not None
         assert chat.frame is not None
 
@@ -61,23 +57,15 @@ class TestChatInterface:
         # Create instance with the mock callback
         chat = ChatInterface(command_callback=mock_callback)
         
-        # Clear the command queue from initialization
-        while not chat.command_queue.empty():
-            chat.command_queue.get()
-        
         # Process command
         test_command = "/test command"
-        chat.process_command(test_command)
+        future = chat.process_command(test_command)
         
-        # Process the command directly since we're mocking the thread
-        chat._process_commands()
+        # threading.Thread is patched, so drive the command loop here
+        chat._loop.run_until_complete(asyncio.wrap_future(future, loop=chat._loop))
         
         # Check callback was called with the correct command
         mock_callback.assert_called_once_with(test_command)
-        
-        # Check command was added to queue
-        assert chat.command_queue.qsize() == 1
-        assert chat.command_queue.get() == test_command
 
     @patch('modules.chat_interface.SpeechHandler')
     @patch('wx.Panel')
@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+# Import module to test
+from modules.input_controller import InputController, _PASTE_MODIFIER
+
+class _ClipboardError(Exception):
+    """Stands in for pyperclip.PyperclipException"""
+
+@pytest.fixture
+def controller():
+    """InputController on a fixed screen size, without the native backend"""
+    with patch('modules.input_controller._query_screen_size', return_value=(1920, 1080)), \
+         patch('modules.input_controller.Quartz', None):
+        yield InputController()
+
+class TestInputController:
+    """Tests for the InputController class"""
+    
+    @patch('modules.input_controller.pyperclip')
+    @patch('modules.input_controller.pyautogui')
+    def test_type_text_pastes_long_text(self, mock_pyautogui, mock_pyperclip, controller):
+        """Test that long unpaced text is pasted in one shortcut"""
+        text = "x" * 60
+        
+        assert controller.type_text(text, interval=0) is True
+        mock_pyperclip.copy.assert_called_once_with(text)
+        mock_pyautogui.hotkey.assert_called_once_with(_PASTE_MODIFIER, 'v')
+        mock_pyautogui.typewrite.assert_not_called()
+    
+    @patch('modules.input_controller.pyperclip')
+    @patch('modules.input_controller.pyautogui')
+    def test_type_text_clipboard_fallback(self, mock_pyautogui, mock_pyperclip, controller):
+        """Test that text is typed when the clipboard cannot be used"""
+        mock_pyperclip.PyperclipException = _ClipboardError
+        mock_pyperclip.copy.side_effect = _ClipboardError("no copy/paste mechanism")
+        text = "x" * 60
+        
+        assert controller.type_text(text, interval=0) is True
+        mock_pyautogui.hotkey.assert_not_called()
+        mock_pyautogui.typewrite.assert_called_once_with(text, interval=0)
+    
+    @patch('modules.input_controller.pyperclip')
+    @patch('modules.input_controller.pyautogui')
+    def test_type_text_short_or_paced(self, mock_pyautogui, mock_pyperclip, controller):
+        """Test that short or paced text is typed key by key"""
+        controller.type_text("hello", interval=0)
+        controller.type_text("x" * 60, interval=0.01)
+        
+        mock_pyperclip.copy.assert_not_called()
+        assert mock_pyautogui.typewrite.call_count == 2
\ No newline at end of file
@@ -0,0 +1,56 @@
+import pytest
+
+# Import module to test
+from intent_processor_fallback import IntentProcessorFallback
+
+class TestIntentProcessorFallback:
+    """Tests for the IntentProcessorFallback class"""
+
+    def test_pattern_intents(self):
+        """Test intents recognized by the combined regex"""
+        processor = IntentProcessorFallback()
+
+        assert processor.process_text("click on the submit button") == ('click', 'the submit button')
+        assert processor.process_text("type hello world") == ('type', 'hello world')
+        assert processor.process_text("open youtube.com") == ('open', 'youtube.com')
+        assert processor.process_text("help") == ('help', None)
+        assert processor.process_text("goodbye") == ('exit', None)
+
+    def test_anchored_patterns(self):
+        """Test that anchored patterns trim whitespace and trailing punctuation"""
+        processor = IntentProcessorFallback()
+
+        assert processor.process_text(" Open YouTube.com.") == ('open', 'YouTube.com')
+        assert processor.process_text("Click on the Submit button!") == ('click', 'the Submit button')
+        assert processor.process_text("what can you do?") == ('help', None)
+
+    def test_scroll_parameters(self):
+        """Test scroll direction and amount extraction"""
+        processor = IntentProcessorFallback()
+
+        assert processor.process_text("Scroll down 10") == ('scroll', {'direction': 'down', 'amount': 10})
+        assert processor.process_text("scroll up") == ('scroll', {'direction': 'up', 'amount': 5})
+        assert processor.process_text("scroll down 3 lines") == ('scroll', {'direction': 'down', 'amount': 3})
+        assert processor.process_text("scroll down 123456") == ('scroll', {'direction': 'down', 'amount': 5})
+
+    def test_unknown_intent(self):
+        """Test text that matches no intent"""
+        processor = IntentProcessorFallback()
+
+        assert processor.process_text("blah") == ('unknown', None)
+
+    def test_keyword_fallback(self):
+        """Test verb scan used when no pattern matches"""
+        processor = IntentProcessorFallback()
+
+        assert processor.process_text("i want to scroll") == ('scroll', {'direction': 'down', 'amount': 5})
+        assert processor.process_text("that was helpful") == ('help', None)
+        assert processor.process_text("please launch") == ('unknown', None)
+
+    def test_first_word_verb(self):
+        """Test the first-word lookup ahead of the full verb scan"""
+        processor = IntentProcessorFallback()
+
+        assert processor.process_text("go home") == ('open', 'home')
+        assert processor.process_text("scroll please") == ('scroll', {'direction': 'down', 'amount': 5})
+        assert processor.process_text("click") == ('unknown', None)
\ No newline at end of file
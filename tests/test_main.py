@@ -1,11 +1,6 @@
-import sys
-import os
 import pytest
 from unittest.mock import MagicMock, patch
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Import module to test
 from main import BuddyApp
 
@@ -1,30 +1,32 @@
-import sys
-import os
 import pytest
 import json
 from unittest.mock import MagicMock, patch
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Import module to test
 from ollama_intent_processor import OllamaIntentProcessor
 
+def _tags_response():
+    """Mock /api/tags response listing the models Ollama has installed"""
+    response = MagicMock()
+    response.status_code = 200
+    response.content = json.dumps({"models": [{"name": "llama3", "size": 1000000}]}).encode()
+    return response
+
 class TestOllamaIntentProcessor:
     """Tests for the OllamaIntentProcessor class"""
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_init_and_model_selection(self, mock_get):
         """Test initialization and model selection"""
         # Mock the Ollama API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "models": [
                 {"name": "llama3", "size": 1000000, "modified_at": 1000, "details": {}},
                 {"name": "mistral", "size": 2000000, "modified_at": 2000, "details": {}}
             ]
-        }
+        }).encode()
         mock_get.return_value = mock_response
         
         # Create instance with default config
@@ -42,22 +44,23 @@ class TestOllamaIntentProcessor:
         processor = OllamaIntentProcessor(config=mock_config)
         assert processor.model == "mistral"
     
-    @patch('requests.post')
-    def test_process_text(self, mock_post):
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_process_text(self, mock_post, mock_get):
         """Test text processing"""
         # Mock the Ollama API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "response": '{"intent": "click", "parameters": {"target": "submit button"}}'
-        }
+        mock_response.iter_lines.return_value = [
+            json.dumps({"response": '{"intent": "click", "parameters": {"target": "submit button"}}', "done": True}).encode()
+        ]
         mock_post.return_value = mock_response
         
         # Create instance
         processor = OllamaIntentProcessor()
         
         # Test processing text
-        intent, params = processor.process_text("Click on the submit button")
+        intent, params = processor.process_text("Could you hit the submit button")
         
         # Check results
         assert intent == "click"
@@ -65,19 +68,75 @@ class TestOllamaIntentProcessor:
         
         # Verify API call
         mock_post.assert_called_once()
-        call_args = mock_post.call_args[1]['json']
+        call_args = json.loads(mock_post.call_args[1]['data'])
         assert call_args['model'] == "llama3"
-        assert "Click on the submit button" in call_args['prompt']
+        assert "Could you hit the submit button" in call_args['prompt']
+    
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_process_text_stops_at_complete_json(self, mock_post, mock_get):
+        """Test that the stream is closed once the intent JSON is complete"""
+        chunks = ['{"intent": "type", ', '"parameters": {"text": "hello"}}', ' trailing', ' tokens']
+        lines = [json.dumps({"response": chunk, "done": False}).encode() for chunk in chunks]
+        read = []
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = (read.append(line) or line for line in lines)
+        mock_post.return_value = mock_response
+        
+        processor = OllamaIntentProcessor()
+        
+        assert processor.process_text("please enter the greeting") == ('type', 'hello')
+        assert len(read) == 2
+        mock_response.close.assert_called_once()
+        assert mock_post.call_args[1]['stream'] is True
+    
+    @patch('requests.Session.post')
+    def test_process_text_fast_path(self, mock_post):
+        """Test that plain commands are matched without calling Ollama"""
+        processor = OllamaIntentProcessor()
+        
+        assert processor.process_text("scroll down 3") == ('scroll', {'direction': 'down', 'amount': 3})
+        assert processor.process_text("open YouTube.com") == ('open', 'YouTube.com')
+        assert processor.process_text("What can you do?") == ('help', None)
+        assert processor.process_text("quit") == ('exit', None)
+        mock_post.assert_not_called()
     
-    @patch('requests.post')
-    def test_process_text_unknown_intent(self, mock_post):
+    @pytest.mark.parametrize('text', [
+        "close the browser window",
+        "help me write an email to Bob",
+        "what can you do with images?",
+        "type of music do you like?",
+        "start a conversation about cats",
+        "move down a bit",
+    ])
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_process_text_ambiguous_uses_ollama(self, mock_post, mock_get, text):
+        """Test that phrasings that only start like a command go to Ollama"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = [
+            json.dumps({"response": '{"intent": "conversation", "response": "Sure"}', "done": True}).encode()
+        ]
+        mock_post.return_value = mock_response
+        
+        processor = OllamaIntentProcessor()
+        
+        assert processor.process_text(text)[0] == 'conversation'
+        mock_post.assert_called_once()
+    
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_process_text_unknown_intent(self, mock_post, mock_get):
         """Test processing text with unknown intent"""
         # Mock the Ollama API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "response": '{"intent": "unknown", "parameters": {}}'
-        }
+        mock_response.iter_lines.return_value = [
+            json.dumps({"response": '{"intent": "unknown", "parameters": {}}', "done": True}).encode()
+        ]
         mock_post.return_value = mock_response
         
         # Create instance
@@ -90,8 +149,9 @@ class TestOllamaIntentProcessor:
         assert intent == "unknown"
         assert params == {}
     
-    @patch('requests.post')
-    def test_process_text_error(self, mock_post):
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_process_text_error(self, mock_post, mock_get):
         """Test processing text with API error"""
         # Mock the Ollama API error
         mock_post.side_effect = Exception("API Error")
@@ -100,21 +160,22 @@ class TestOllamaIntentProcessor:
         processor = OllamaIntentProcessor()
         
         # Test processing text
-        intent, params = processor.process_text("Click on the submit button")
+        intent, params = processor.process_text("Could you hit the submit button")
         
         # Check results (should default to unknown)
         assert intent == "unknown"
         assert params is None
     
-    @patch('requests.post')
-    def test_generate_response(self, mock_post):
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_generate_response(self, mock_post, mock_get):
         """Test response generation"""
         # Mock the Ollama API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "response": "I'll click on that button for you right away!"
-        }
+        mock_response.iter_lines.return_value = [
+            json.dumps({"response": "I'll click on that button for you right away!", "done": True}).encode()
+        ]
         mock_post.return_value = mock_response
         
         # Create instance
@@ -128,13 +189,14 @@ class TestOllamaIntentProcessor:
         
         # Verify API call
         mock_post.assert_called_once()
-        call_args = mock_post.call_args[1]['json']
+        call_args = json.loads(mock_post.call_args[1]['data'])
         assert call_args['model'] == "llama3"
         assert "Intent: click" in call_args['prompt']
         assert "Parameters: submit button" in call_args['prompt']
     
-    @patch('requests.post')
-    def test_generate_response_error(self, mock_post):
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_generate_response_error(self, mock_post, mock_get):
         """Test response generation with API error"""
         # Mock the Ollama API error
         mock_post.side_effect = Exception("API Error")
@@ -152,15 +214,16 @@ class TestOllamaIntentProcessor:
         response = processor.generate_response("unknown", None)
         assert "I'm not sure what you want me to do" in response
     
-    @patch('requests.post')
-    def test_llm_rules(self, mock_post):
+    @patch('requests.Session.get', return_value=_tags_response())
+    @patch('requests.Session.post')
+    def test_llm_rules(self, mock_post, mock_get):
         """Test LLM rules integration"""
         # Mock the Ollama API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "response": "Yes, I am here."
-        }
+        mock_response.iter_lines.return_value = [
+            json.dumps({"response": "Yes, I am here.", "done": True}).encode()
+        ]
         mock_post.return_value = mock_response
         
         # Create instance with config
@@ -180,7 +243,7 @@ class TestOllamaIntentProcessor:
         response = processor.generate_response("greeting", None)
         assert response == "Yes, I am here."
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_server_connection(self, mock_get):
         """Test Ollama server connection monitoring"""
         # Mock successful connection
@@ -1,18 +1,21 @@
-import sys
-import os
 import pytest
 from unittest.mock import MagicMock, patch
 import numpy as np
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Import module to test
 from modules.screen_reader import ScreenReader
 
+@pytest.fixture(scope='module')
+def screen_reader():
+    """ScreenReader with the default configuration, shared by the tests that
+    do not patch its construction; tests patch attributes rather than assign them"""
+    return ScreenReader()
+
 class TestScreenReader:
     """Tests for the ScreenReader class"""
     
+    @patch('modules.screen_reader.tesserocr', None)
+    @patch('modules.screen_reader.mss', None)
     @patch('pytesseract.pytesseract')
     @patch('PIL.ImageGrab.grab')
     def test_capture_screen(self, mock_grab, mock_pytesseract):
@@ -40,6 +43,22 @@ class TestScreenReader:
         screen_reader.capture_screen(region)
         mock_grab.assert_called_with(bbox=(100, 100, 300, 300))
 
+    @patch('modules.screen_reader.mss', None)
+    @patch('PIL.ImageGrab.grab')
+    def test_capture_screen_returns_copy(self, mock_grab):
+        """Test that captured frames are not overwritten by the next capture"""
+        mock_grab.side_effect = [
+            np.zeros((60, 80, 3), dtype=np.uint8),
+            np.full((60, 80, 3), 255, dtype=np.uint8),
+        ]
+        screen_reader = ScreenReader()
+        
+        first = screen_reader.capture_screen()
+        second = screen_reader.capture_screen()
+        assert first is not screen_reader._frame_buf
+        assert first.max() == 0 and second.min() == 255
+
+    @patch('modules.screen_reader.tesserocr', None)
     @patch('pytesseract.image_to_data')
     def test_text_confidence(self, mock_image_to_data):
         """Test text confidence filtering"""
@@ -70,14 +89,99 @@ class TestScreenReader:
         assert len(results) == 2
         assert results[1]['text'] == 'Medium'
     
-    def test_image_preprocessing(self):
+    @patch('pytesseract.image_to_data')
+    def test_extract_text_batched(self, mock_image_to_data, screen_reader):
+        """Test that batched OCR results are split back per image"""
+        mock_image_to_data.return_value = {
+            'page_num': [1, 1, 2, 2],
+            'text': ['', 'First', '', 'Second'],
+            'conf': [-1, 95, -1, 90],
+            'left': [0, 10, 0, 20],
+            'top': [0, 10, 0, 20],
+            'width': [100, 40, 100, 50],
+            'height': [100, 20, 100, 20]
+        }
+        
+        images = [np.zeros((100, 100, 3), dtype=np.uint8) for _ in range(2)]
+        
+        with patch.object(screen_reader, '_tess_api', None):
+            results = screen_reader.extract_text_batched(images)
+        
+        # One tesseract call for the whole batch
+        assert mock_image_to_data.call_count == 1
+        assert [[r['text'] for r in page] for page in results] == [['First'], ['Second']]
+    
+    def test_extract_text_many_reuses_workers(self):
+        """Test that parallel OCR keeps one worker pool until cleanup"""
+        screen_reader = ScreenReader()
+        images = [np.zeros((10, 10, 3), dtype=np.uint8) for _ in range(3)]
+        
+        with patch.object(screen_reader, 'extract_text', side_effect=lambda image: [image.shape]):
+            assert screen_reader.extract_text_many(images) == [[(10, 10, 3)]] * 3
+            executor = screen_reader._ocr_executor
+            screen_reader.extract_text_many(images)
+            assert screen_reader._ocr_executor is executor
+        
+        screen_reader.cleanup()
+        assert screen_reader._ocr_executor is None
+        assert executor._shutdown
+    
+    @patch('modules.screen_reader.tesserocr', None)
+    @patch('pytesseract.image_to_data')
+    def test_tile_cache(self, mock_image_to_data):
+        """Test that unchanged tiles are not OCR'd again"""
+        mock_image_to_data.return_value = {
+            'text': ['Word'], 'conf': [95], 'left': [5], 'top': [5], 'width': [20], 'height': [10]
+        }
+        
+        config = {'screen_reader': {'ocr_tile_size': 100}}
+        screen_reader = ScreenReader(config=config)
+        test_image = np.zeros((100, 200, 3), dtype=np.uint8)
+        test_image[:, 100:] = 255
+        
+        results = screen_reader.extract_text(test_image)
+        assert mock_image_to_data.call_count == 2
+        assert [r['position'] for r in results] == [(5, 5, 20, 10), (105, 5, 20, 10)]
+        
+        # Same frame again is served from the cache
+        screen_reader.extract_text(test_image)
+        assert mock_image_to_data.call_count == 2
+    
+    def test_find_elements_by_texts(self, screen_reader):
+        """Test multi-target text search over one OCR pass"""
+        elements = [
+            {'text': 'Submit', 'center': (10, 10)},
+            {'text': 'Cancel order', 'center': (50, 10)},
+        ]
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        
+        with patch.object(screen_reader, '_capture_frame', return_value=frame), \
+             patch.object(screen_reader, 'extract_text', return_value=elements) as mock_extract, \
+             patch.object(screen_reader, '_last_thumb_hash', None):
+            results = screen_reader.find_elements_by_texts(['submit', 'Order', 'cancel', 'help'])
+            assert results == {'submit': elements[0], 'Order': elements[1], 'cancel': elements[1], 'help': None}
+            
+            # Single-target search reuses the OCR result of the unchanged screen
+            assert screen_reader.find_element_by_text('ORDER') == elements[1]
+            assert mock_extract.call_count == 1
+    
+    def test_find_elements_by_prefix_texts(self, screen_reader):
+        """Test targets that start at the same position in one element"""
+        elements = [{'text': 'Save as', 'center': (10, 10)}]
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        
+        with patch.object(screen_reader, '_capture_frame', return_value=frame), \
+             patch.object(screen_reader, 'extract_text', return_value=elements), \
+             patch.object(screen_reader, '_last_thumb_hash', None):
+            results = screen_reader.find_elements_by_texts(['save', 'save as', 'as'])
+        
+        assert results == {'save': elements[0], 'save as': elements[0], 'as': elements[0]}
+    
+    def test_image_preprocessing(self, screen_reader):
         """Test image preprocessing"""
         # Create test image with noise
         noisy_image = np.random.randint(0, 255, (100, 200, 3), dtype=np.uint8)
         
-        # Create instance
-        screen_reader = ScreenReader()
-        
         # Test preprocessing
         processed = screen_reader.preprocess_image(noisy_image)
         
@@ -1,13 +1,59 @@
 import sys
-import os
+import queue
+import time
+import threading
+import asyncio
 import pytest
+import speech_recognition as sr
+import numpy as np
 from unittest.mock import MagicMock, patch, call  # Added call import
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Import module to test
-from speech_handler import SpeechHandler
+from multiprocessing import shared_memory
+from speech_handler import SpeechHandler, _AudioRing, _STREAM_STOP, _asr_process_main, _transcribe_batch
+
+def wait_for(condition, timeout=1.0):
+    """Poll until condition() is true or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+# Stand-in for say -f: like say, it only speaks line by line when its input
+# is a terminal and reads the whole input first otherwise
+_FAKE_SAY = """
+import sys
+with open(sys.argv[1], 'a', buffering=1) as out:
+    if sys.stdin.isatty():
+        for line in iter(sys.stdin.readline, ''):
+            out.write(line)
+    else:
+        out.write(sys.stdin.read())
+"""
+
+@pytest.fixture(autouse=True)
+def tts_cache_dir(tmp_path):
+    """Keep the TTS cache of every handler out of the real home directory"""
+    cache_dir = tmp_path / "tts"
+    with patch.object(SpeechHandler, '_TTS_CACHE_DIR', str(cache_dir)):
+        yield cache_dir
+
+@pytest.fixture(autouse=True)
+def energy_cache(tmp_path):
+    """Keep the saved energy threshold out of the real home directory;
+    recognition resets delete it"""
+    path = tmp_path / "energy_threshold"
+    with patch.object(SpeechHandler, '_ENERGY_CACHE', str(path)):
+        yield path
+
+@pytest.fixture
+def fake_say(tmp_path):
+    """Run the persistent say process as _FAKE_SAY; returns the file it speaks into"""
+    script = tmp_path / "say.py"
+    script.write_text(_FAKE_SAY)
+    spoken = tmp_path / "spoken.txt"
+    spoken.touch()
+    with patch.object(SpeechHandler, '_SAY_CMD', [sys.executable, str(script), str(spoken)]):
+        yield spoken
 
 class TestSpeechHandler:
     """Tests for the SpeechHandler class"""
@@ -245,8 +291,9 @@ class TestSpeechHandler:
     @patch('speech_recognition.Microphone')
     def test_continuous_conversation_flow(self, mock_mic, mock_recognizer):
         """Test continuous conversation flow without wake word"""
-        # Create mock callback
-        mock_callback = MagicMock()
+        # Create mock callback that signals once the last phrase arrives
+        finished = threading.Event()
+        mock_callback = MagicMock(side_effect=lambda text: text == "5+5" and finished.set())
         
         # Setup mock recognizer
         mock_recognizer_instance = mock_recognizer.return_value
@@ -267,7 +314,7 @@ class TestSpeechHandler:
         handler.start_listening()
         
         # Wait for recognition thread to process all inputs
-        time.sleep(0.5)  # Allow time for processing
+        finished.wait(timeout=2)
         
         # Verify the conversation flow
         mock_callback.assert_has_calls([
@@ -277,4 +324,405 @@ class TestSpeechHandler:
         ], any_order=False)
         
         # Cleanup
-        handler.stop_listening()
\ No newline at end of file
+        handler.stop_listening()
+    
+    @patch('speech_handler.webrtcvad', None)
+    @patch('speech_handler.WhisperModel', None)
+    @patch('speech_recognition.Recognizer')
+    @patch('speech_recognition.Microphone')
+    def test_capture_overlaps_recognition(self, mock_mic, mock_recognizer, tmp_path):
+        """Test that the fallback loop keeps capturing while Whisper is busy"""
+        mock_callback = MagicMock()
+        release = threading.Event()
+        captured = []
+        
+        def listen(source, **kwargs):
+            if len(captured) >= 3:
+                time.sleep(0.01)
+                raise sr.WaitTimeoutError()
+            captured.append(MagicMock())
+            return captured[-1]
+        
+        recognizer = mock_recognizer.return_value
+        recognizer.listen.side_effect = listen
+        recognizer.recognize_whisper.side_effect = lambda audio, **kwargs: release.wait(1) and "hello"
+        
+        with patch.object(SpeechHandler, '_ENERGY_CACHE', str(tmp_path / "energy_threshold")):
+            handler = SpeechHandler(speech_callback=mock_callback)
+            handler.start_listening()
+            
+            # All three phrases are captured while the first is still in Whisper
+            wait_for(lambda: len(captured) == 3)
+            assert len(captured) == 3
+            mock_callback.assert_not_called()
+            
+            release.set()
+            wait_for(lambda: mock_callback.call_count == 3)
+            handler.stop_listening()
+        
+        assert mock_callback.call_count == 3
+        mock_callback.assert_called_with("hello")
+        handler.cleanup()
+    
+    @patch.object(SpeechHandler, '_ASR_SUBPROCESS', False)
+    @patch('speech_handler.WhisperModel')
+    @patch('speech_recognition.Recognizer')
+    def test_transcribe_faster_whisper(self, mock_recognizer, mock_model):
+        """Test transcription through the persistent faster-whisper model"""
+        segment = MagicMock()
+        segment.text = " Open Safari "
+        mock_model.return_value.transcribe.return_value = ([segment], None)
+        
+        audio = MagicMock()
+        audio.get_raw_data.return_value = b'\x00\x00' * 1600
+        
+        handler = SpeechHandler(speech_callback=MagicMock())
+        
+        assert handler._transcribe(audio) == "open safari"
+        assert handler._transcribe(audio) == "open safari"
+        
+        # Model is loaded once and kept on the handler
+        assert handler.asr is mock_model.return_value
+        assert mock_model.call_args[1]['compute_type'] == 'int8'
+        assert handler.asr.transcribe.call_count >= 2
+        mock_recognizer.return_value.recognize_whisper.assert_not_called()
+    
+    @patch.object(SpeechHandler, '_ASR_SUBPROCESS', False)
+    @patch('speech_handler.WhisperModel')
+    @patch('speech_recognition.Recognizer')
+    def test_streaming_local_agreement(self, mock_recognizer, mock_model):
+        """Test that a stable partial transcript is reused when the phrase closes"""
+        segment = MagicMock()
+        segment.text = "open safari"
+        mock_model.return_value.transcribe.return_value = ([segment], None)
+        mock_callback = MagicMock()
+        
+        handler = SpeechHandler(speech_callback=mock_callback)
+        assert handler.asr_ready.wait(timeout=1)
+        handler.asr.transcribe.reset_mock()
+        handler._audio_queue = asyncio.Queue()
+        one_second = np.full(SpeechHandler._SAMPLE_RATE, 0.01, dtype=np.float32)
+        for item in (one_second, one_second, None, _STREAM_STOP):
+            handler._audio_queue.put_nowait(item)
+        
+        asyncio.run_coroutine_threadsafe(handler._asr_loop(), handler._loop).result(timeout=2)
+        
+        # Two partial passes agreed, so no final pass was needed
+        assert handler.asr.transcribe.call_count == 2
+        mock_callback.assert_called_once_with("open safari")
+    
+    @patch.object(SpeechHandler, '_ASR_SUBPROCESS', False)
+    @patch('speech_handler.WhisperModel')
+    @patch('speech_recognition.Recognizer')
+    def test_streaming_final_pass_after_partials(self, mock_recognizer, mock_model):
+        """Test that audio after the last partial transcript is still transcribed"""
+        partial, final = MagicMock(), MagicMock()
+        partial.text = "open"
+        final.text = "open safari"
+        mock_callback = MagicMock()
+        
+        handler = SpeechHandler(speech_callback=mock_callback)
+        assert handler.asr_ready.wait(timeout=1)
+        handler.asr.transcribe.reset_mock()
+        handler.asr.transcribe.side_effect = [([partial], None), ([partial], None), ([final], None)]
+        handler._audio_queue = asyncio.Queue()
+        one_second = np.full(SpeechHandler._SAMPLE_RATE, 0.01, dtype=np.float32)
+        half_second = one_second[:SpeechHandler._SAMPLE_RATE // 2]
+        for item in (one_second, one_second, half_second, None, _STREAM_STOP):
+            handler._audio_queue.put_nowait(item)
+        
+        asyncio.run_coroutine_threadsafe(handler._asr_loop(), handler._loop).result(timeout=2)
+        
+        # The partials agreed, but the trailing half second needs a final pass
+        assert handler.asr.transcribe.call_count == 3
+        mock_callback.assert_called_once_with("open safari")
+    
+    @patch('speech_recognition.Recognizer')
+    def test_vad_skips_silence(self, mock_recognizer):
+        """Test that phrases without voiced frames never reach Whisper"""
+        handler = SpeechHandler(speech_callback=MagicMock())
+        handler.vad = MagicMock()
+        handler.vad.is_speech.return_value = False
+        
+        audio = MagicMock()
+        audio.get_raw_data.return_value = b'\x00\x00' * SpeechHandler._SAMPLE_RATE
+        
+        assert handler._transcribe(audio) == ""
+        mock_recognizer.return_value.recognize_whisper.assert_not_called()
+    
+    @patch('speech_recognition.Recognizer')
+    def test_persistent_say_process(self, mock_recognizer, fake_say):
+        """Test that lines written to the long-lived say process are spoken
+        before its input ends"""
+        handler = SpeechHandler(speech_callback=MagicMock())
+        proc = handler.say_proc
+        handler.speak("Hello\nworld")
+        handler.speak("Second message")
+        wait_for(lambda: fake_say.read_text() == "Hello world\nSecond message\n")
+        
+        # Spoken while say is still running and reading its input
+        assert fake_say.read_text() == "Hello world\nSecond message\n"
+        assert handler.say_proc is proc and proc.poll() is None
+        
+        handler.cleanup()
+        assert handler.say_proc is None
+        assert proc.poll() is not None
+    
+    @patch('speech_recognition.Recognizer')
+    def test_speak_dedup_and_priority(self, mock_recognizer, fake_say):
+        """Test that quick repeats are dropped and priority messages interrupt"""
+        handler = SpeechHandler(speech_callback=MagicMock())
+        first_proc = handler.say_proc
+        handler.speak("Yes, I'm listening actively now.")
+        handler.speak("Yes, I'm listening actively now.")
+        wait_for(lambda: fake_say.read_text())
+        handler.speak("Goodbye!", priority=True)
+        wait_for(lambda: fake_say.read_text().endswith("Goodbye!\n"))
+        
+        assert fake_say.read_text() == "Yes, I'm listening actively now.\nGoodbye!\n"
+        
+        # The interrupted say process was replaced
+        assert first_proc.poll() is not None
+        proc = handler.say_proc
+        assert proc is not first_proc
+        
+        # Shutdown lets say finish the queued goodbye instead of interrupting it
+        handler.finish_speaking(timeout=1)
+        assert handler.say_proc is None
+        assert proc.returncode == 0
+        
+        handler.cleanup()
+    
+    @patch('speech_handler.AVSpeechSynthesisVoice', create=True)
+    @patch('speech_handler.AVSpeechUtterance', create=True)
+    @patch('speech_handler.AVSpeechSynthesizer')
+    @patch('speech_handler.subprocess.Popen')
+    @patch('speech_recognition.Recognizer')
+    def test_native_synthesizer(self, mock_recognizer, mock_popen, mock_synth_cls, mock_utterance, mock_voice):
+        """Test that the AVSpeechSynthesizer is used instead of say when available"""
+        synth = mock_synth_cls.alloc.return_value.init.return_value
+        
+        handler = SpeechHandler(speech_callback=MagicMock())
+        handler.speak("Hello there")
+        wait_for(lambda: synth.speakUtterance_.called)
+        
+        mock_utterance.speechUtteranceWithString_.assert_called_once_with("Hello there")
+        synth.speakUtterance_.assert_called_once_with(mock_utterance.speechUtteranceWithString_.return_value)
+        mock_popen.assert_not_called()
+        
+        handler.cleanup()
+        synth.stopSpeakingAtBoundary_.assert_called_with(0)
+    
+    @patch('speech_handler.pty', None)
+    @patch('speech_handler.subprocess.run')
+    @patch('speech_handler.subprocess.Popen')
+    @patch('speech_recognition.Recognizer')
+    def test_tts_cache(self, mock_recognizer, mock_popen, mock_run, tts_cache_dir):
+        """Test that a repeated message is rendered once by say and then played with afplay"""
+        mock_popen.return_value.communicate.return_value = (b"", b"")
+        mock_popen.return_value.returncode = 0
+        mock_run.side_effect = lambda cmd, **kwargs: open(cmd[cmd.index('-o') + 1], 'wb').close()
+        text = "-Recognition reset complete."
+        
+        with patch.object(SpeechHandler, '_SPEAK_DEDUP_WINDOW', 0):
+            handler = SpeechHandler(speech_callback=MagicMock())
+            for _ in range(3):
+                handler.speak(text)
+        wait_for(lambda: mock_popen.call_count == 3)
+        
+        # Spoken by say the first time, rendered once on the repeat, then replayed
+        assert mock_popen.call_args_list[0].args[0] == SpeechHandler._SAY_CMD + [text]
+        mock_run.assert_called_once()
+        assert text not in mock_run.call_args.args[0]
+        assert mock_run.call_args.kwargs['input'] == text.encode()
+        assert len(list(tts_cache_dir.glob("*.caf"))) == 1
+        assert all(c.args[0][0] == 'afplay' for c in mock_popen.call_args_list[1:])
+        
+        handler.cleanup()
+    
+    @patch('speech_handler.NSURL', create=True)
+    @patch('speech_handler.AVAudioFile', create=True)
+    @patch('speech_handler.AVSpeechSynthesisVoice', create=True)
+    @patch('speech_handler.AVSpeechUtterance', create=True)
+    @patch('speech_handler.AVSpeechSynthesizer')
+    @patch('speech_handler.subprocess.run')
+    @patch('speech_handler.subprocess.Popen')
+    @patch('speech_recognition.Recognizer')
+    def test_tts_cache_native(self, mock_recognizer, mock_popen, mock_run, mock_synth_cls, mock_utterance,
+                              mock_voice, mock_audio_file, mock_url, tts_cache_dir):
+        """Test that the cache is rendered by the synthesizer that speaks live, per voice"""
+        synth = mock_synth_cls.alloc.return_value.init.return_value
+        synth.isSpeaking.return_value = False
+        mock_popen.return_value.communicate.return_value = (b"", b"")
+        mock_popen.return_value.returncode = 0
+        mock_voice.voiceWithLanguage_.return_value.identifier.return_value = "voice.one"
+        mock_url.fileURLWithPath_.side_effect = lambda path: path
+        mock_audio_file.alloc.return_value.initForWriting_settings_error_.side_effect = (
+            lambda url, settings, error: (open(url, 'wb').close() or MagicMock(), None))
+        
+        def render(utterance, callback):
+            callback(MagicMock(**{'frameLength.return_value': 256}))
+            callback(MagicMock(**{'frameLength.return_value': 0}))
+        synth.writeUtterance_toBufferCallback_.side_effect = render
+        
+        with patch.object(SpeechHandler, '_SPEAK_DEDUP_WINDOW', 0):
+            handler = SpeechHandler(speech_callback=MagicMock())
+            for _ in range(3):
+                handler.speak("Recognition reset complete.")
+        wait_for(lambda: mock_popen.call_count == 2)
+        
+        # Spoken live once, rendered with the same voice and rate, then replayed
+        synth.speakUtterance_.assert_called_once()
+        synth.writeUtterance_toBufferCallback_.assert_called_once()
+        mock_utterance.speechUtteranceWithString_.return_value.setVoice_.assert_called_with(
+            mock_voice.voiceWithLanguage_.return_value)
+        mock_run.assert_not_called()
+        assert all(c.args[0][0] == 'afplay' for c in mock_popen.call_args_list)
+        
+        # Another voice does not reuse the rendered file
+        rendered = list(tts_cache_dir.glob("*.caf"))
+        assert len(rendered) == 1
+        mock_voice.voiceWithLanguage_.return_value.identifier.return_value = "voice.two"
+        assert handler._tts_cache_path("Recognition reset complete.") is None
+        
+        handler.cleanup()
+    
+    @patch.object(SpeechHandler, '_ASR_SUBPROCESS', False)
+    @patch('speech_handler.WhisperModel')
+    @patch('speech_recognition.Recognizer')
+    def test_asr_warm_up(self, mock_recognizer, mock_model):
+        """Test that the model is loaded and run once at construction"""
+        mock_model.return_value.transcribe.return_value = (iter([]), None)
+        
+        handler = SpeechHandler(speech_callback=MagicMock())
+        
+        assert handler.asr_ready.wait(timeout=1)
+        assert handler.asr is mock_model.return_value
+        silence = handler.asr.transcribe.call_args[0][0]
+        assert not silence.any()
+    
+    @patch('speech_handler.webrtcvad', None)
+    @patch('speech_handler.WhisperModel', None)
+    @patch('speech_recognition.Recognizer')
+    def test_shared_whisper_model(self, mock_recognizer):
+        """Test that the fallback recognizer reuses one warmed-up openai-whisper model"""
+        model = MagicMock()
+        model.transcribe.return_value = {'text': " Open Safari"}
+        audio = MagicMock()
+        audio.get_raw_data.return_value = b'\x00\x00' * 1600
+        
+        with patch.object(SpeechHandler, '_whisper_model', model):
+            handler = SpeechHandler(speech_callback=MagicMock())
+            assert handler.asr_ready.wait(timeout=1)
+            silence = model.transcribe.call_args[0][0]
+            assert not silence.any()
+            
+            assert handler._transcribe(audio) == "open safari"
+            assert model.transcribe.call_args[1]['fp16'] is False
+        
+        mock_recognizer.return_value.recognize_whisper.assert_not_called()
+        handler.cleanup()
+    
+    def test_audio_ring_wraparound(self):
+        """Test that the capture ring buffer returns blocks across the wrap point"""
+        ring = _AudioRing(8)
+        ring.callback(np.arange(6, dtype=np.int16).tobytes(), 6, None, None)
+        assert ring.read(4, timeout=0) == np.arange(4, dtype=np.int16).tobytes()
+        
+        ring.callback(np.arange(6, 10, dtype=np.int16).tobytes(), 4, None, None)
+        assert ring.read(6, timeout=0) == np.arange(4, 10, dtype=np.int16).tobytes()
+        
+        # Nothing left to read
+        assert ring.read(1, timeout=0) is None
+    
+    @patch('speech_handler.WhisperModel')
+    def test_asr_process_main(self, mock_model):
+        """Test the ASR child process loop reading audio from shared memory"""
+        segment = MagicMock()
+        segment.text = " scroll down"
+        received = []
+        mock_model.return_value.transcribe.side_effect = (
+            lambda pcm, **options: (received.append(pcm.copy()), ([segment], None))[1]
+        )
+        
+        shm = shared_memory.SharedMemory(create=True, size=4 * 1600)
+        try:
+            pcm = np.ndarray((1600,), dtype=np.float32, buffer=shm.buf)
+            pcm[:] = 0.25
+            pcm_q = queue.Queue()
+            text_q = queue.Queue()
+            pcm_q.put((shm.name, [800], {'language': 'en'}))
+            pcm_q.put(None)
+            
+            _asr_process_main({'model_size_or_path': 'base'}, pcm_q, text_q)
+            
+            assert text_q.get_nowait() == ([[" scroll down"]], None)
+            assert len(received[0]) == 800 and (received[0] == 0.25).all()
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    def test_transcribe_batch_routing(self):
+        """Test that batched segments are routed back to their utterance"""
+        def segment(start, text):
+            seg = MagicMock()
+            seg.start = start
+            seg.text = text
+            return seg
+        
+        pipeline = MagicMock()
+        pipeline.transcribe.return_value = (
+            [segment(0.0, "open"), segment(0.4, "safari"), segment(1.0, "scroll down")],
+            None
+        )
+        pcms = [np.zeros(16000, dtype=np.float32), np.zeros(8000, dtype=np.float32)]
+        
+        texts = _transcribe_batch(pipeline, pcms, 16000, {'language': 'en'})
+        
+        assert texts == [["open", "safari"], ["scroll down"]]
+        kwargs = pipeline.transcribe.call_args[1]
+        assert kwargs['clip_timestamps'] == [{'start': 0, 'end': 16000}, {'start': 16000, 'end': 24000}]
+        assert kwargs['batch_size'] == 2
+    
+    @patch('speech_recognition.Recognizer')
+    def test_reset_recognition_keeps_recognizer(self, mock_recognizer, energy_cache):
+        """Test that resetting recognition restores settings in place"""
+        energy_cache.write_text("1234.0")
+        mock_callback = MagicMock()
+        handler = SpeechHandler(speech_callback=mock_callback)
+        recognizer = handler.recognizer
+        recognizer.energy_threshold = 12000
+        handler.error_count = 3
+        
+        handler._reset_recognition()
+        
+        assert handler.recognizer is recognizer
+        assert mock_recognizer.call_count == 1
+        assert recognizer.energy_threshold == 4000
+        assert handler.error_count == 0
+        assert not energy_cache.exists()
+        mock_callback.assert_called_once_with("Recognition reset complete. Please try speaking again.")
+    
+    @patch('speech_recognition.Recognizer')
+    def test_energy_threshold_cache(self, mock_recognizer, tmp_path):
+        """Test that calibration is saved, reused, and forgotten on reset"""
+        cache = tmp_path / "energy_threshold"
+        with patch.object(SpeechHandler, '_ENERGY_CACHE', str(cache)):
+            handler = SpeechHandler(speech_callback=MagicMock())
+            recognizer = handler.recognizer
+            source = MagicMock()
+            
+            recognizer.energy_threshold = 1234.0
+            handler._calibrate(source)
+            recognizer.adjust_for_ambient_noise.assert_called_once_with(source, duration=0.3)
+            assert cache.read_text() == "1234.0"
+            
+            # The next session starts from the saved value
+            recognizer.energy_threshold = 4000
+            handler._calibrate(source)
+            assert recognizer.adjust_for_ambient_noise.call_count == 1
+            assert recognizer.energy_threshold == 1234.0
+            
+            handler._reset_recognition()
+            assert not cache.exists()
+            handler.cleanup()
@@ -1,10 +1,26 @@
 import os
-import yaml
+import atexit
+import struct
+import threading
 from loguru import logger
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# st_mtime_ns and st_size of the YAML file the snapshot was built from
+_CACHE_HEADER = struct.Struct('<qq')
+
 class Config:
     """Configuration manager for Buddy application"""
     
+    __slots__ = ('config', 'config_path', 'cache_path', '_save_lock', '_save_timer', '_dirty')
+    
+    _SAVE_DELAY = 0.25  # seconds set() waits so bursts of updates share one write
+    
     def __init__(self, config_path=None):
         """Initialize configuration manager
         
@@ -12,18 +28,30 @@ class Config:
             config_path (str, optional): Path to config file. Defaults to None.
         """
         self.config = {}
-        self.config_path = config_path or os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            'config.yaml'
-        )
+        self.config_path = config_path or os.path.join(_PROJECT_ROOT, 'config.yaml')
+        # msgpack snapshot of the parsed YAML, reused while the YAML is unchanged
+        self.cache_path = self.config_path + '.cache'
+        
+        # Pending write scheduled by set()
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        atexit.register(self.flush)
+        
         self.load_config()
     
     def load_config(self):
         """Load configuration from file"""
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    self.config = yaml.safe_load(f) or {}
+                config = self._load_cache()
+                if config is None:
+                    # yaml is only imported when the snapshot cannot be used
+                    import yaml
+                    with open(self.config_path, 'r') as f:
+                        config = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+                    self._write_cache(config)
+                self.config = config
                 logger.info(f"Loaded configuration from {self.config_path}")
             else:
                 logger.warning(f"Config file not found at {self.config_path}, using defaults")
@@ -36,12 +64,55 @@ class Config:
     def save_config(self):
         """Save configuration to file"""
         try:
-            with open(self.config_path, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False)
+            import yaml
+            
+            # Write a temporary file and swap it in so readers never see a partial config
+            tmp_path = self.config_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                yaml.dump(self.config, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper), default_flow_style=False)
+            os.replace(tmp_path, self.config_path)
+            self._write_cache(self.config)
             logger.info(f"Saved configuration to {self.config_path}")
         except Exception as e:
             logger.error(f"Error saving config: {e}")
     
+    def _load_cache(self):
+        """Load the msgpack snapshot if it was built from the current YAML file
+        
+        Returns:
+            dict: Cached configuration, or None if there is no valid snapshot
+        """
+        if msgpack is None:
+            return None
+        try:
+            st = os.stat(self.config_path)
+            with open(self.cache_path, 'rb') as f:
+                data = f.read()
+            if data[:_CACHE_HEADER.size] != _CACHE_HEADER.pack(st.st_mtime_ns, st.st_size):
+                return None
+            return msgpack.unpackb(data[_CACHE_HEADER.size:], raw=False)
+        except (OSError, ValueError, msgpack.UnpackException) as e:
+            logger.debug(f"Config cache not used: {e}")
+            return None
+    
+    def _write_cache(self, config):
+        """Write the msgpack snapshot for the current YAML file
+        
+        Args:
+            config (dict): Configuration parsed from the YAML file
+        """
+        if msgpack is None:
+            return
+        try:
+            st = os.stat(self.config_path)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_CACHE_HEADER.pack(st.st_mtime_ns, st.st_size))
+                f.write(msgpack.packb(config, use_bin_type=True))
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write config cache: {e}")
+    
     def get(self, key, default=None):
         """Get configuration value
         
@@ -62,7 +133,25 @@ class Config:
             value: Configuration value
         """
         self.config[key] = value
-        self.save_config()
+        
+        # Coalesce updates into one save after a short delay
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self._SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self):
+        """Write pending changes from set() to the config file now"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self.save_config()
     
     def _get_default_config(self):
         """Get default configuration
@@ -74,6 +163,9 @@ class Config:
             'screen_reader': {
                 'ocr_engine': 'tesseract',
                 'confidence_threshold': 0.7,
+                'ocr_scale': 0.5,
+                'ocr_tile_size': 0,
+                'use_opencl': True,
             },
             'input_controller': {
                 'move_duration': 0.5,
@@ -91,6 +183,7 @@ class Config:
                 'window_height': 800,
                 'font_size': 10,
                 'max_history': 100,
+                'queue_max': 256,
             },
         }
     
@@ -1,11 +1,19 @@
 import sys
-import traceback
+import time
 import threading
+import collections
 from loguru import logger
 
 class ErrorHandler:
     """Global error handler for crash recovery and logging."""
     
+    _REPEAT_WINDOW = 60.0  # seconds in which the same exception is logged without its traceback
+    _MAX_SEEN = 64
+    
+    # (type name, message, file, line) of recent exceptions -> [count, last seen]
+    _seen = collections.OrderedDict()
+    _seen_lock = threading.Lock()
+    
     @staticmethod
     def init():
         """Initialize global error handling."""
@@ -25,7 +33,7 @@ class ErrorHandler:
             sys.__excepthook__(exc_type, exc_value, exc_traceback)
             return
         
-        logger.error("Uncaught exception:", exc_info=(exc_type, exc_value, exc_traceback))
+        ErrorHandler._log("Uncaught exception:", exc_type, exc_value, exc_traceback)
     
     @staticmethod
     def handle_thread_exception(args):
@@ -37,5 +45,44 @@ class ErrorHandler:
         if args.exc_type == SystemExit:
             return
         
-        logger.error(f"Uncaught thread exception in {args.thread.name}:",
-                    exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
\ No newline at end of file
+        name = args.thread.name if args.thread else "unknown thread"
+        ErrorHandler._log(f"Uncaught thread exception in {name}:",
+                          args.exc_type, args.exc_value, args.exc_traceback)
+    
+    @staticmethod
+    def _log(message, exc_type, exc_value, exc_traceback):
+        """Log an exception, formatting the traceback only on its first occurrence
+        
+        An exception with the same type, message and raising line seen within
+        _REPEAT_WINDOW seconds is logged as a one-line repeat count instead.
+        
+        Args:
+            message (str): Log message
+            exc_type: Exception type
+            exc_value: Exception value
+            exc_traceback: Exception traceback
+        """
+        tb = exc_traceback
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        where = (tb.tb_frame.f_code.co_filename, tb.tb_lineno) if tb is not None else (None, 0)
+        key = (exc_type.__name__, str(exc_value)[:200]) + where
+        
+        now = time.monotonic()
+        with ErrorHandler._seen_lock:
+            entry = ErrorHandler._seen.get(key)
+            if entry is not None and now - entry[1] < ErrorHandler._REPEAT_WINDOW:
+                entry[0] += 1
+                entry[1] = now
+                count = entry[0]
+            else:
+                ErrorHandler._seen[key] = [1, now]
+                count = 1
+            ErrorHandler._seen.move_to_end(key)
+            if len(ErrorHandler._seen) > ErrorHandler._MAX_SEEN:
+                ErrorHandler._seen.popitem(last=False)
+        
+        if count > 1:
+            logger.error(f"{message} {exc_type.__name__}: {key[1]} (repeated x{count})")
+        else:
+            logger.opt(exception=(exc_type, exc_value, exc_traceback)).error(message)
\ No newline at end of file
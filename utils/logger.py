@@ -1,7 +1,41 @@
 import os
 import sys
+import traceback
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PLAIN_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+_COLOR_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+
+def _json_format(record):
+    """Format a record as one JSON line for the file sink
+    
+    Args:
+        record (dict): loguru record
+        
+    Returns:
+        str: Template that writes the serialized record
+    """
+    entry = {
+        'time': record['time'].isoformat(),
+        'level': record['level'].name,
+        'name': record['name'],
+        'function': record['function'],
+        'line': record['line'],
+        'thread': record['thread'].name,
+        'message': record['message'],
+    }
+    if record['exception'] is not None:
+        entry['exception'] = ''.join(traceback.format_exception(*record['exception']))
+    record['extra']['_json'] = orjson.dumps(entry, default=str).decode()
+    return "{extra[_json]}\n"
+
 def setup_logger(log_file=None):
     """Configure logger for the application
     
@@ -13,24 +47,34 @@ def setup_logger(log_file=None):
     
     # Determine log file path if not provided
     if log_file is None:
-        log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
+        log_dir = os.path.join(_PROJECT_ROOT, 'logs')
         os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, 'buddy.log')
+        log_file = os.path.join(log_dir, 'buddy.log.jsonl' if orjson is not None else 'buddy.log')
     
-    # Add console logger
+    # Add console logger; BUDDY_QUIET=1 keeps INFO records off the console.
+    # Color markup is only used on a terminal, redirected output gets the
+    # plain format
+    is_tty = sys.stderr.isatty()
     logger.add(
         sys.stderr,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO"
+        format=_COLOR_FORMAT if is_tty else _PLAIN_FORMAT,
+        colorize=is_tty,
+        level="WARNING" if os.environ.get("BUDDY_QUIET") == "1" else "INFO"
     )
     
-    # Add file logger
+    # Add file logger, as JSON lines when orjson is installed. Records are
+    # written (and the file rotated) by a background thread so logging
+    # never blocks the speech and OCR loops
     logger.add(
         log_file,
         rotation="10 MB",
         retention="1 week",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="DEBUG"
+        format=_json_format if orjson is not None else _PLAIN_FORMAT,
+        level="DEBUG",
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
+        catch=True
     )
     
     return logger
\ No newline at end of file